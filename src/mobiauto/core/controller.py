@@ -703,16 +703,25 @@ class MobileController:
                 platform=self._platform,
             )
             try:
+                # Read once per call: every repetition uses the same window size
                 try:
                     size = self.driver.get_window_size()
                     w, h = size.get("width", 0) or 0, size.get("height", 0) or 0
                 except Exception:
                     w, h = 0, 0
 
-                left = max(int(w * 0.01), 1)
-                top = max(int(h * 0.01), 1)
-                width = max(int(w * 0.7), 1)
-                height = max(int(h * 0.7), 1)
+                # Gesture geometry is the same for every repetition - build it once
+                scroll_args = {
+                    "left": max(int(w * 0.01), 1),
+                    "top": max(int(h * 0.01), 1),
+                    "width": max(int(w * 0.7), 1),
+                    "height": max(int(h * 0.7), 1),
+                    "direction": direction,
+                    "percent": capacity,
+                }
+                # how many steps to do per iOS gesture
+                # 10–20 steps are usually enough for smoothness
+                steps = max(5, min(25, duration_ms // 40))  # ~40ms per step
 
                 # for iOS - invert the direction, because swipe_screen operates
                 # on the gesture direction, not the logical "screen scrolling"
@@ -735,26 +744,13 @@ class MobileController:
                     if self.is_android:
                         # Android: keep mobile: scrollGesture with "logical" direction
                         try:
-                            self.driver.execute_script(
-                                "mobile: scrollGesture",
-                                {
-                                    "left": left,
-                                    "top": top,
-                                    "width": width,
-                                    "height": height,
-                                    "direction": direction,
-                                    "percent": capacity,
-                                },
-                            )
+                            self.driver.execute_script("mobile: scrollGesture", scroll_args)
                         except Exception:
                             # swallow single gesture errors
                             pass
                     else:
                         # iOS: W3C swipe in gesture direction (inversion of logical direction)
                         try:
-                            # how many steps to do per gesture
-                            # 10–20 steps are usually enough for smoothness
-                            steps = max(5, min(25, duration_ms // 40))  # ~40ms per step
                             self.swipe_screen(
                                 direction=ios_swipe_direction, steps=steps, percent=capacity
                             )
@@ -30,20 +30,23 @@ def _context_platform() -> str | None:
     return None
 
 
-def _run_actions(
+def _run_actions_raising(actions: Iterable[Callable[[], None]]) -> None:
+    """Execute a list of actions, letting any exception propagate."""
+    for action in actions:
+        action()
+
+
+def _run_actions_suppressing(
     actions: Iterable[Callable[[], None]],
     *,
-    suppress: bool,
     on_error: Callable[[BaseException], None] | None,
     meta: Mapping[str, object] | None = None,
 ) -> None:
-    """Execute a list of actions with optional exception suppression and logging."""
+    """Execute a list of actions, suppressing and logging exceptions of each step."""
     for idx, action in enumerate(actions, start=1):
         try:
             action()
         except Exception as e:  # noqa: PERF203 - intentionally broad by design
-            if not suppress:
-                raise
             # Log suppressed error
             try:
                 _logger.warning(
@@ -73,6 +76,33 @@ def _run_actions(
                         pass
 
 
+def _run_actions(
+    actions: Iterable[Callable[[], None]],
+    *,
+    suppress: bool,
+    on_error: Callable[[BaseException], None] | None,
+    meta: Mapping[str, object] | None = None,
+) -> None:
+    """Execute a list of actions with optional exception suppression and logging."""
+    if suppress:
+        _run_actions_suppressing(actions, on_error=on_error, meta=meta)
+    else:
+        _run_actions_raising(actions)
+
+
+def _only_for(platform: Platform, action: Callable[[], None]) -> None:
+    """Execute a single action without suppression if the current platform matches."""
+    current = _context_platform() or ""
+    if current != platform.value:
+        _logger.debug(
+            "Skip optional_for: platform mismatch",
+            target_platform=platform.value,
+            current_platform=current,
+        )
+        return
+    action()
+
+
 def optional_for(
     platform: str | Platform,
     *actions: Callable[[], None],
@@ -130,12 +160,12 @@ def optional_android(
 
 def only_ios(action: Callable[[], None]) -> None:
     """Execute the action only on iOS. Exceptions are not suppressed."""
-    optional_for(Platform.IOS, action, suppress=False)
+    _only_for(Platform.IOS, action)
 
 
 def only_android(action: Callable[[], None]) -> None:
     """Execute the action only on Android. Exceptions are not suppressed."""
-    optional_for(Platform.ANDROID, action, suppress=False)
+    _only_for(Platform.ANDROID, action)
 
 
 __all__ = [
@@ -1,19 +1,33 @@
 from __future__ import annotations
 
+import atexit
+import hashlib
+import logging
+import threading
 import time
-from collections.abc import Callable, Sequence
-from typing import Literal, cast
+import weakref
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import AbstractContextManager, nullcontext
+from typing import TYPE_CHECKING, Any, Literal, NoReturn
 
 import allure
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import (
+    ERROR_URL,
+    SUPPORT_MSG,
+    NoSuchElementException,
+    TimeoutException,
+    WebDriverException,
+)
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.ui import WebDriverWait
 
 from ..reporting.manager import ReportManager
-from ..utils.logging import get_logger
+from ..utils.logging import get_logger, is_enabled_for
 from .locators import PageElement, StrategyValue, pretty_locator, resolve_to_selenium
 
+if TYPE_CHECKING:
+    from .controller import MobileController
+
 # ---- Default values ----
 DEFAULT_TIMEOUT_BEFORE_EXPECTATION = 0
 DEFAULT_TIMEOUT_EXPECTATION = 5
@@ -23,61 +37,223 @@ DEFAULT_SCROLL_COUNT = 0
 DEFAULT_SCROLL_CAPACITY = 1.0  # Value in range 0..1
 DEFAULT_SCROLL_DIRECTION: Literal["up", "down", "left", "right"] = "down"
 
+# Polling predicate returning visible elements, or False to keep polling
+_VisiblePredicate = Callable[[WebDriver], list[WebElement] | Literal[False]]
+# Polling predicate returning (matched locator, visible elements), or False to keep polling
+_FoundPredicate = Callable[[WebDriver], tuple[StrategyValue, list[WebElement]] | Literal[False]]
+
+# Returns, for a list of elements, whether each one has a layout box (web contexts only).
+# An element without one (display:none on it or an ancestor, detached) cannot be displayed;
+# one with a box may still be hidden, so is_displayed() has the final word.
+_BATCH_VISIBILITY_SCRIPT = (
+    "return arguments[0].map(function (e) { return !!(e && e.getClientRects().length); });"
+)
+# Contexts, per driver, that rejected the batch visibility script (e.g. NATIVE_APP)
+_NO_BATCH_VISIBILITY: weakref.WeakKeyDictionary[WebDriver, set[str | None]] = (
+    weakref.WeakKeyDictionary()
+)
+
+# Set at interpreter exit: polling sleeps wait on it so they return promptly on shutdown
+_SHUTDOWN = threading.Event()
+atexit.register(_SHUTDOWN.set)
+
+# Chunk size (bytes) for page source digests compared by _wait_for_ui_stability
+_PAGE_CHUNK_SIZE = 4096
+
+# MobileController class, resolved on the first scroll (see _perform_scroll)
+_scroll_impl: type[MobileController] | None = None
+
 _log = get_logger(__name__)
 
 
+class _LazyNoSuchElementException(NoSuchElementException):
+    """
+    NoSuchElementException whose message is built only when it is read
+    (``str(exc)`` / ``exc.msg``), so locator lists are not formatted for
+    misses that end up being caught and discarded.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float,
+        scrolls: int,
+        attempted: list[StrategyValue],
+        failed: list[StrategyValue],
+        cause: Exception | None,
+    ) -> None:
+        super().__init__()
+        # Newer Selenium versions store a support-link placeholder as msg; drop it
+        # so the real message is built from the fields below on first read
+        self._msg: str | None = None
+        self.timeout = timeout
+        self.scrolls = scrolls
+        self.attempted = attempted
+        self.failed = failed
+        self.cause = cause
+
+    @property
+    def msg(self) -> str:
+        if self._msg is None:
+            self._msg = self._format_message()
+        return self._msg
+
+    @msg.setter
+    def msg(self, value: str | None) -> None:
+        self._msg = value
+
+    def _format_message(self) -> str:
+        if self.failed:
+            locators_info = (
+                f"The following locators {self.failed} from {self.attempted} were not found."
+            )
+        elif self.attempted:
+            locators_info = f"Attempts were made to find the following locators: {self.attempted}"
+        else:
+            locators_info = "No locator search attempts were made"
+        text = (
+            f"Elements were not found within '{self.timeout}' seconds after "
+            f"'{self.scrolls}' scroll(s). {locators_info}"
+        )
+        if self.cause is not None:
+            text += f". Original error: {self.cause}"
+        return f"{text}; {SUPPORT_MSG} {ERROR_URL}#nosuchelementexception"
+
+
+def wait_for_elements(
+    driver: WebDriver,
+    target: PageElement | StrategyValue,
+    *,
+    index: int | None = None,
+    settle_for: float = DEFAULT_TIMEOUT_BEFORE_EXPECTATION,
+    timeout: float = DEFAULT_TIMEOUT_EXPECTATION,
+    polling_ms: int = DEFAULT_POLLING_INTERVAL_MS,
+    max_scrolls: int = DEFAULT_SCROLL_COUNT,
+    scroll_percent: float = DEFAULT_SCROLL_CAPACITY,
+    scroll_direction: Literal["up", "down", "left", "right"] = DEFAULT_SCROLL_DIRECTION,
+) -> WebElement:
+    """
+    Wait for a visible element and return the N-th visible one (1-based index).
+
+    Args:
+        driver (WebDriver): Selenium/Appium driver instance.
+        target (PageElement | StrategyValue): Locator to search for.
+        index (int, optional): Index of the element to return (1-based). Defaults to 1.
+        settle_for (float): Wait before starting the search (to stabilize UI).
+        timeout (float): Maximum wait time.
+        polling_ms (int): Polling interval in milliseconds.
+        max_scrolls (int): Maximum number of scroll attempts if element is not found.
+        scroll_percent (float): Portion of the screen to scroll (0..1).
+        scroll_direction (Literal): Scroll direction (default "down").
+
+    Returns:
+        WebElement: The found element.
+
+    Raises:
+        NoSuchElementException: If the element is not found within timeout and after scrolling.
+    """
+    # raise_on_miss=True never returns None; no runtime cast() call needed
+    return _wait_for_elements_impl(  # type: ignore[return-value]
+        driver,
+        target,
+        index=index,
+        settle_for=settle_for,
+        timeout=timeout,
+        polling_ms=polling_ms,
+        max_scrolls=max_scrolls,
+        scroll_percent=scroll_percent,
+        scroll_direction=scroll_direction,
+        raise_on_miss=True,
+    )
+
+
+def wait_for_element_or_none(
+    driver: WebDriver,
+    target: PageElement | StrategyValue,
+    *,
+    index: int | None = None,
+    settle_for: float = DEFAULT_TIMEOUT_BEFORE_EXPECTATION,
+    timeout: float = DEFAULT_TIMEOUT_EXPECTATION,
+    polling_ms: int = DEFAULT_POLLING_INTERVAL_MS,
+    max_scrolls: int = DEFAULT_SCROLL_COUNT,
+    scroll_percent: float = DEFAULT_SCROLL_CAPACITY,
+    scroll_direction: Literal["up", "down", "left", "right"] = DEFAULT_SCROLL_DIRECTION,
+) -> WebElement | None:
+    """
+    Same as wait_for_elements, but returns None instead of raising.
+
+    Useful for optional elements whose absence is non-critical. A miss does not
+    build or raise NoSuchElementException and does not attach failure artifacts.
+
+    Returns:
+        WebElement | None: Found element or None if not found.
+    """
+    return _wait_for_elements_impl(
+        driver,
+        target,
+        index=index,
+        settle_for=settle_for,
+        timeout=timeout,
+        polling_ms=polling_ms,
+        max_scrolls=max_scrolls,
+        scroll_percent=scroll_percent,
+        scroll_direction=scroll_direction,
+        raise_on_miss=False,
+    )
+
+
 class Waits:
     """
     Helper class providing waiting mechanisms for UI elements.
 
     Supports waiting with scrolling, configurable polling,
     and validation that a certain set of elements is visible.
+
+    Kept as a namespace for backward compatibility: the implementations are the
+    module-level functions, which are cheaper to call directly.
     """
 
-    @staticmethod
-    def wait_for_elements(
-        driver: WebDriver,
-        target: PageElement | StrategyValue,
-        *,
-        index: int | None = None,
-        settle_for: float = DEFAULT_TIMEOUT_BEFORE_EXPECTATION,
-        timeout: float = DEFAULT_TIMEOUT_EXPECTATION,
-        polling_ms: int = DEFAULT_POLLING_INTERVAL_MS,
-        max_scrolls: int = DEFAULT_SCROLL_COUNT,
-        scroll_percent: float = DEFAULT_SCROLL_CAPACITY,
-        scroll_direction: Literal["up", "down", "left", "right"] = DEFAULT_SCROLL_DIRECTION,
-    ) -> WebElement:
-        """
-        Wait for a visible element and return the N-th visible one (1-based index).
-
-        Args:
-            driver (WebDriver): Selenium/Appium driver instance.
-            target (PageElement | StrategyValue): Locator to search for.
-            index (int, optional): Index of the element to return (1-based). Defaults to 1.
-            settle_for (float): Wait before starting the search (to stabilize UI).
-            timeout (float): Maximum wait time.
-            polling_ms (int): Polling interval in milliseconds.
-            max_scrolls (int): Maximum number of scroll attempts if element is not found.
-            scroll_percent (float): Portion of the screen to scroll (0..1).
-            scroll_direction (Literal): Scroll direction (default "down").
-
-        Returns:
-            WebElement: The found element.
-
-        Raises:
-            NoSuchElementException: If the element is not found within timeout and after scrolling.
-        """
-        loc = pretty_locator(driver, target)
-        title = (
+    wait_for_elements = staticmethod(wait_for_elements)
+    wait_for_element_or_none = staticmethod(wait_for_element_or_none)
+
+
+def _wait_for_elements_impl(
+    driver: WebDriver,
+    target: PageElement | StrategyValue,
+    *,
+    index: int | None,
+    settle_for: float,
+    timeout: float,
+    polling_ms: int,
+    max_scrolls: int,
+    scroll_percent: float,
+    scroll_direction: Literal["up", "down", "left", "right"],
+    raise_on_miss: bool,
+) -> WebElement | None:
+    """
+    Shared body of Waits.wait_for_elements / Waits.wait_for_element_or_none.
+
+    On a miss, raises NoSuchElementException when `raise_on_miss` is True,
+    otherwise returns None without formatting the error message.
+    """
+    # pretty_locator already returns a string: compute it once for all steps and logs
+    loc = pretty_locator(driver, target)
+    debug = is_enabled_for(logging.DEBUG)
+    step: AbstractContextManager[Any] = (
+        allure.step(
             f"Wait for element: {loc} "
             f"(timeout={timeout}s, polling={polling_ms}ms, scrolls={max_scrolls})"
         )
-        with allure.step(title):
-            # Technical logging of wait parameters
+        if ReportManager.is_allure_collecting()
+        else nullcontext()
+    )
+    with step:
+        # Technical logging of wait parameters
+        if debug:
             _log.debug(
                 "Waiting for element",
                 action="wait",
-                locator=str(loc),
+                locator=loc,
                 timeout=timeout,
                 polling_ms=polling_ms,
                 max_scrolls=max_scrolls,
@@ -86,173 +262,237 @@ class Waits:
                 scroll_percent=scroll_percent,
                 scroll_direction=scroll_direction,
             )
-            try:
-                if settle_for and settle_for > 0:
-                    _wait_for_ui_stability(driver, settle_for, polling_ms)
-
-                wait = WebDriverWait(driver, timeout, poll_frequency=polling_ms / 1000.0)
-
-                # Initialize the controller once for potential scroll actions
-                from .controller import MobileController
-
-                controller = MobileController(driver, ReportManager.get_default())
-
-                current_scroll = 0
-                while True:
-                    tuples: list[StrategyValue] = resolve_to_selenium(driver, target)
-
-                    last_exc: Exception | None = None
-                    attempted: list[StrategyValue] = []
-                    failed: list[StrategyValue] = []
-
-                    safe_index = index or 1
-                    if safe_index < 1:
-                        raise IndexError(f"Index must be >= 1, got {safe_index}")
-
-                    # Try all locators until one succeeds
-                    for t in tuples:
-                        try:
-                            attempted.append(t)
-                            visible_list = cast(
-                                list[WebElement], wait.until(_nth_visible_condition(t, safe_index))
-                            )
-                            _log.debug(
-                                "Element found",
-                                action="wait",
-                                locator=str(loc),
-                                index=safe_index,
-                                used_locator=str(t),
-                            )
-                            return visible_list[safe_index - 1]
-                        except Exception as e:
-                            last_exc = e
-                            failed.append(t)
-                            continue
-
-                    # If allowed - perform scroll and retry
-                    if max_scrolls > 0 and current_scroll < max_scrolls:
-                        controller.perform_scroll(
-                            count=1,
-                            capacity=scroll_percent,
-                            direction=scroll_direction,
+        try:
+            if settle_for and settle_for > 0:
+                _wait_for_ui_stability(driver, settle_for, polling_ms)
+
+            # The index is invariant across scroll retries - validate it once
+            safe_index = index or 1
+            if safe_index < 1:
+                raise IndexError(f"Index must be >= 1, got {safe_index}")
+
+            # Locator resolution depends only on the target and the driver platform,
+            # both fixed for the whole wait: resolve once, not on every scroll retry
+            tuples = resolve_to_selenium(driver, target)
+            # Locators actually queried, in order; on a miss these are the ones that failed
+            queried: dict[StrategyValue, None] = {}
+            # One predicate racing all locators, in priority order
+            predicate = _nth_visible_any_condition(tuples, safe_index, queried)
+            # Created on the first scroll only: most waits never scroll
+            controller: MobileController | None = None
+
+            current_scroll = 0
+            last_exc: Exception | None = None
+            # One budget for the whole wait: scroll retries share it instead of each
+            # getting the full timeout. Once spent, a round still checks the screen once.
+            end = time.monotonic() + timeout
+            while True:
+                remaining = max(end - time.monotonic(), 0.0)
+                try:
+                    used, visible_list = _poll_until(
+                        driver, predicate, remaining, _backoff_schedule(polling_ms)
+                    )
+                    if debug:
+                        _log.debug(
+                            "Element found",
+                            action="wait",
+                            locator=loc,
+                            index=safe_index,
+                            used_locator=str(used),
                         )
-                        current_scroll += 1
+                    return visible_list[safe_index - 1]
+                except Exception as e:
+                    last_exc = e
+
+                # If allowed - perform scroll and retry
+                if max_scrolls > 0 and current_scroll < max_scrolls:
+                    controller = _perform_scroll(
+                        driver, scroll_percent, scroll_direction, controller
+                    )
+                    current_scroll += 1
+                    if debug:
                         _log.debug(
                             "Scroll performed",
                             action="scroll",
-                            locator=str(loc),
+                            locator=loc,
                             current_scroll=current_scroll,
                             capacity=scroll_percent,
                             direction=scroll_direction,
                         )
-                        continue
-
-                    # Build debug info for error message
-                    locators_info = (
-                        f"The following locators {failed} from {attempted} were not found."
-                        if failed
-                        else (
-                            f"Attempts were made to find the following locators: {attempted}"
-                            if attempted
-                            else "No locator search attempts were made"
-                        )
-                    )
-                    if last_exc is not None:
-                        _log.error(
+                    continue
+
+                if not raise_on_miss:
+                    if debug:
+                        _log.debug(
                             "Element not found",
                             action="wait",
-                            locator=str(loc),
+                            locator=loc,
                             timeout=timeout,
                             scrolls=current_scroll,
-                            attempted=len(attempted) or 0,
-                            last_error=str(last_exc),
                         )
-                        raise NoSuchElementException(
-                            f"Elements were not found within '{timeout}' seconds after "
-                            f"'{current_scroll}' scroll(s). {locators_info}. "
-                            f"Original error: {last_exc}"
-                        ) from last_exc
-                    _log.error(
-                        "Element not found",
-                        action="wait",
-                        locator=str(loc),
-                        timeout=timeout,
-                        scrolls=current_scroll,
-                        attempted=len(attempted) or 0,
-                    )
-                    raise NoSuchElementException(
-                        f"Elements were not found within '{timeout}' seconds after "
-                        f"'{current_scroll}' scroll(s). {locators_info}"
-                    )
-            except Exception:
-                # On wait step failure - attach artifacts centrally
-                ReportManager.get_default().attach_artifacts_on_failure(driver)
-                raise
-
-    @staticmethod
-    def wait_for_element_or_none(
-        driver: WebDriver,
-        target: PageElement | StrategyValue,
-        *,
-        index: int | None = None,
-        settle_for: float = DEFAULT_TIMEOUT_BEFORE_EXPECTATION,
-        timeout: float = DEFAULT_TIMEOUT_EXPECTATION,
-        polling_ms: int = DEFAULT_POLLING_INTERVAL_MS,
-        max_scrolls: int = DEFAULT_SCROLL_COUNT,
-        scroll_percent: float = DEFAULT_SCROLL_CAPACITY,
-        scroll_direction: Literal["up", "down", "left", "right"] = DEFAULT_SCROLL_DIRECTION,
-    ) -> WebElement | None:
-        """
-        Same as wait_for_elements, but returns None instead of raising.
-
-        Useful for optional elements whose absence is non-critical.
-
-        Returns:
-            WebElement | None: Found element or None if not found.
-        """
-        try:
-            return Waits.wait_for_elements(
-                driver=driver,
-                target=target,
-                index=index,
-                settle_for=settle_for,
-                timeout=timeout,
-                polling_ms=polling_ms,
-                max_scrolls=max_scrolls,
-                scroll_percent=scroll_percent,
-                scroll_direction=scroll_direction,
-            )
-        except NoSuchElementException:
-            return None
+                    return None
+
+                _raise_not_found(loc, timeout, current_scroll, tuples, list(queried), last_exc)
+        except Exception:
+            # On wait step failure - attach artifacts centrally
+            ReportManager.get_default().attach_artifacts_on_failure(driver)
+            raise
 
 
 # ---- Internal helper functions ----
-def _nth_visible_condition(
-    t: StrategyValue, n: int
-) -> Callable[[WebDriver], list[WebElement] | bool]:
+def _perform_scroll(
+    driver: WebDriver,
+    capacity: float,
+    direction: Literal["up", "down", "left", "right"],
+    controller: MobileController | None = None,
+) -> MobileController:
+    """
+    Single scroll primitive used by the waits: delegates to MobileController.perform_scroll,
+    which owns the platform-specific gestures and reporting.
+
+    The controller is created on first use and returned so callers can reuse it.
     """
-    Create a WebDriverWait.until predicate that returns the list of visible elements
+    global _scroll_impl
+    if controller is None:
+        if _scroll_impl is None:
+            # Imported lazily: the controller module imports this one
+            from .controller import MobileController
+
+            _scroll_impl = MobileController
+        controller = _scroll_impl(driver, ReportManager.get_default())
+    controller.perform_scroll(count=1, capacity=capacity, direction=direction)
+    return controller
+
+
+def _raise_not_found(
+    loc: str,
+    timeout: float,
+    scrolls: int,
+    attempted: list[StrategyValue],
+    failed: list[StrategyValue],
+    last_exc: Exception | None,
+) -> NoReturn:
+    """
+    Log and raise the not-found error; only reached once the wait budget is exhausted.
+
+    `attempted` are the locators resolved for the target, `failed` those that were
+    actually queried without a match.
+    """
+    _log.error(
+        "Element not found",
+        action="wait",
+        locator=loc,
+        timeout=timeout,
+        scrolls=scrolls,
+        attempted=len(attempted),
+        failed=len(failed),
+        last_error=str(last_exc) if last_exc is not None else None,
+    )
+    raise _LazyNoSuchElementException(
+        timeout=timeout,
+        scrolls=scrolls,
+        attempted=attempted,
+        failed=failed,
+        cause=last_exc,
+    ) from last_exc
+
+
+def _nth_visible_condition(t: StrategyValue, n: int) -> _VisiblePredicate:
+    """
+    Create a polling predicate that returns the list of visible elements
     when at least `n` are visible; otherwise returns False.
     """
 
-    def _predicate(drv: WebDriver) -> list[WebElement] | bool:
+    def _predicate(drv: WebDriver) -> list[WebElement] | Literal[False]:
         try:
             els: list[WebElement] = drv.find_elements(*t)
-        except Exception:
+        except WebDriverException:
             return False
-        visible = [e for e in els if _is_displayed_safe(e)]
-        return visible if len(visible) >= n else False
+        mask = _visibility_mask(drv, els)
+        if mask is not None:
+            # Elements that cannot be displayed are skipped without an RPC each
+            els = [e for e, maybe_shown in zip(els, mask, strict=True) if maybe_shown]
+            if len(els) < n:
+                return False
+        # Per-element RPCs: stop as soon as the first `n` visible elements are known.
+        # The is_displayed() check is inlined: this loop runs for every element on every poll
+        visible = []
+        for e in els:
+            try:
+                shown = e.is_displayed()
+            except WebDriverException:
+                # Stale/detached elements count as hidden
+                continue
+            if shown:
+                visible.append(e)
+                if len(visible) >= n:
+                    return visible
+        return False
 
     return _predicate
 
 
-def _is_displayed_safe(el: WebElement) -> bool:
-    """Safely check if element is displayed, ignoring exceptions."""
-    try:
-        return bool(el.is_displayed())
-    except Exception:
+def _nth_visible_any_condition(
+    tuples: Sequence[StrategyValue],
+    n: int,
+    queried: dict[StrategyValue, None] | None = None,
+) -> _FoundPredicate:
+    """
+    Create a polling predicate that tries every locator on each poll and returns
+    `(locator, visible elements)` for the first one with at least `n` visible
+    elements; otherwise returns False.
+
+    All locators thus share one timeout instead of being waited for one after another.
+    Each locator tried is recorded in `queried`, when given.
+    """
+    conditions = [(t, _nth_visible_condition(t, n)) for t in tuples]
+
+    def _predicate(drv: WebDriver) -> tuple[StrategyValue, list[WebElement]] | Literal[False]:
+        for t, condition in conditions:
+            if queried is not None:
+                queried[t] = None
+            visible = condition(drv)
+            if visible:
+                return t, visible
         return False
 
+    return _predicate
+
+
+def _visibility_mask(drv: WebDriver, els: list[WebElement]) -> list[bool] | None:
+    """
+    Pre-filter several elements for visibility with a single execute_script round-trip.
+
+    A False entry means the element cannot be displayed; a True entry still has to be
+    confirmed with is_displayed(). Returns None when every element should go through
+    is_displayed(): for fewer than two elements, or when the driver's current context
+    cannot run the script (native app contexts). The latter is remembered per context,
+    so switching to a WEBVIEW context brings the batch path back.
+    """
+    if len(els) < 2:
+        return None
+    rejected = _NO_BATCH_VISIBILITY.get(drv)
+    # The context is only looked up (one RPC) for drivers that have rejected the script
+    if rejected is not None and _current_context(drv) in rejected:
+        return None
+    try:
+        mask = drv.execute_script(_BATCH_VISIBILITY_SCRIPT, els)
+    except WebDriverException:
+        mask = None
+    if not isinstance(mask, list) or len(mask) != len(els):
+        _NO_BATCH_VISIBILITY.setdefault(drv, set()).add(_current_context(drv))
+        return None
+    return [bool(m) for m in mask]
+
+
+def _current_context(drv: WebDriver) -> str | None:
+    """Return the driver's current Appium context (None if unknown or not an Appium driver)."""
+    try:
+        context = getattr(drv, "current_context", None)
+    except WebDriverException:
+        return None
+    return context if isinstance(context, str) else None
+
 
 def _any_visible(tuples: Sequence[StrategyValue]) -> Callable[[WebDriver], WebElement | bool]:
     """
@@ -260,33 +500,111 @@ def _any_visible(tuples: Sequence[StrategyValue]) -> Callable[[WebDriver], WebEl
     among the given locators, or False if none are visible.
     """
 
+    # Snapshot the locators once instead of re-reading the caller's sequence per poll
+    locators = tuple(tuples)
+
     def _predicate(driver: WebDriver) -> WebElement | bool:
-        for by, value in tuples:
+        find_element = driver.find_element
+        for loc in locators:
             try:
-                el: WebElement = driver.find_element(by, value)
+                el: WebElement = find_element(*loc)
                 if el and el.is_displayed():
                     return el
-            except Exception:
+            except WebDriverException:
                 continue
         return False
 
     return _predicate
 
 
+def _backoff_schedule(polling_ms: int, cap_factor: int = 4) -> Iterator[float]:
+    """
+    Yield polling intervals (seconds): start at `polling_ms`, double on each poll,
+    never exceeding `cap_factor` times the base interval.
+    """
+    base = (polling_ms if polling_ms > 0 else DEFAULT_POLLING_INTERVAL_MS) / 1000.0
+    cap = base * cap_factor
+    interval = base
+    while True:
+        yield interval
+        interval = min(interval * 2, cap)
+
+
+def _poll_until[T](
+    driver: WebDriver,
+    predicate: Callable[[WebDriver], T | Literal[False]],
+    timeout: float,
+    schedule: Iterator[float],
+) -> T:
+    """
+    FluentWait-style replacement for WebDriverWait.until with a pluggable polling schedule.
+
+    Returns the first truthy predicate result; raises TimeoutException once `timeout`
+    elapses. NoSuchElementException raised by the predicate is ignored, as in WebDriverWait.
+    """
+    end = time.monotonic() + timeout
+    while True:
+        try:
+            value = predicate(driver)
+            if value:
+                return value
+        except NoSuchElementException:
+            pass
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutException()
+        if _SHUTDOWN.wait(min(next(schedule), remaining)):
+            raise TimeoutException("Interpreter is shutting down")
+
+
+def _page_chunk_digests(source: str, chunk_size: int = _PAGE_CHUNK_SIZE) -> list[bytes]:
+    """
+    Digest the page source in fixed-size chunks.
+
+    Comparing two such lists stops at the first differing chunk, so a change near
+    the top of a long page is detected without comparing the rest of it.
+    """
+    data = source.encode("utf-8", "ignore")
+    blake2b = hashlib.blake2b
+    return [
+        blake2b(data[i : i + chunk_size], digest_size=8).digest()
+        for i in range(0, len(data), chunk_size)
+    ]
+
+
 def _wait_for_ui_stability(driver: WebDriver, timeout_seconds: float, polling_ms: int) -> None:
     """
     Wait until the UI stabilizes (page source stops changing), or timeout elapses.
 
+    Stability requires two consecutive unchanged snapshots, so a momentarily blank
+    page is not mistaken for a settled one. While the page is unchanged the polling
+    interval doubles (capped at 8x the base, or 2s) to fetch fewer large sources;
+    any change resets it to the base interval.
+
+    Snapshots are compared as lists of per-chunk digests (see _page_chunk_digests)
+    instead of keeping the previous (potentially multi-MB) page source around.
+
     Useful to avoid race conditions after navigation or animations.
     """
+    base = max(polling_ms, 50) / 1000.0
+    cap = max(base * 8, 2.0)
+    interval = base
     end = time.monotonic() + timeout_seconds
-    previous: str | None = None
+    previous: list[bytes] | None = None
+    unchanged = 0
     while time.monotonic() < end:
         try:
-            current = driver.page_source
+            current = _page_chunk_digests(driver.page_source)
         except Exception:
             return
         if previous is not None and current == previous:
-            return
+            unchanged += 1
+            if unchanged >= 2:
+                return
+            interval = min(interval * 2, cap)
+        else:
+            unchanged = 0
+            interval = base
         previous = current
-        time.sleep(max(polling_ms, 50) / 1000.0)
+        if _SHUTDOWN.wait(interval):
+            return
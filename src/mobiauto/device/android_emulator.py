@@ -1,16 +1,93 @@
 from __future__ import annotations
 
+import hashlib
+import logging
+import os
+import queue
 import shlex
 import subprocess
 import tempfile
+import threading
 import time
+from collections import deque
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any, cast
 
-from ..utils.cli import run_cmd
-from ..utils.logging import get_logger
+from cryptography import x509
+from cryptography.hazmat.primitives import serialization
+
+from ..utils.cli import Completed, run_cmd
+from ..utils.logging import get_logger, is_enabled_for
 from .base import EmulatorManager
 
+# Headless mode for CI/headless environments, resolved once at import
+_HEADLESS = os.environ.get("CI") == "true" or os.environ.get("HEADLESS") == "1"
+
+# Emulator launch command without -avd/-port; extra flags for stable startup and CI
+_EMULATOR_BASE = ("emulator", "-no-boot-anim", "-no-snapshot-load", "-no-audio")
+_EMULATOR_BASE_HEADLESS = (*_EMULATOR_BASE, "-no-window")
+
+# Emulator console lines kept for diagnostics, and the line it prints once booted
+_OUTPUT_MAX_LINES = 2048
+_BOOT_MARKER = "boot completed"
+
+# Boot-completion polling: first interval and cap (seconds), growing 1.5x per probe
+_READY_POLL_INITIAL_S = 0.1
+_READY_POLL_MAX_S = 2.0
+
+# Boot-state properties read together in one probe (see _boot_completed)
+_BOOT_PROBE = "getprop sys.boot_completed; getprop dev.bootcomplete; getprop init.svc.bootanim"
+
+# Read-back polls after `settings put` until the proxy value is visible
+_PROXY_SETTLE_POLLS = 10
+_PROXY_SETTLE_POLL_S = 0.05
+
+# Markers framing each command's output in the persistent adb shell session
+_SHELL_BEGIN = "__MOBIAUTO_BEGIN__"
+_SHELL_END = "__MOBIAUTO_END__"
+# Longest wait for one command's output before the shell session is deemed wedged
+_SHELL_READ_TIMEOUT_S = 10.0
+
+# Successful readiness checks are trusted for this long (seconds), keyed by adb serial
+_READY_CACHE_TTL_S = 5.0
+_ready_cache: dict[str, float] = {}
+
+
+def _boot_completed(probe_output: str) -> bool:
+    """
+    Decide readiness from the output of _BOOT_PROBE (one property value per line).
+
+    `sys.boot_completed=1` is authoritative; `dev.bootcomplete=1` flips earlier and
+    is accepted once the boot animation is no longer running.
+    """
+    sys_boot, dev_boot, bootanim = [*probe_output.splitlines(), "", "", ""][:3]
+    if sys_boot.strip() == "1":
+        return True
+    return dev_boot.strip() == "1" and bootanim.strip() != "running"
+
+
+def _subject_hash_old(cert: x509.Certificate) -> str:
+    """
+    Return the certificate's `openssl x509 -subject_hash_old` value (8 hex chars).
+
+    This is the little-endian first word of the MD5 of the DER-encoded subject.
+    """
+    digest = hashlib.md5(cert.subject.public_bytes(), usedforsecurity=False).digest()
+    return f"{int.from_bytes(digest[:4], 'little'):08x}"
+
+
+def _read_lines(stream: Iterable[str] | None, out: queue.Queue[str | None]) -> None:
+    """Forward lines of `stream` (without line endings) to `out`, then None at its end."""
+    try:
+        for raw in stream or ():
+            out.put(raw.rstrip("\r\n"))
+    except (OSError, ValueError):
+        # Stream closed while the session was being torn down
+        pass
+    finally:
+        out.put(None)
+
 
 class AndroidEmulatorManager(EmulatorManager):
     """
@@ -29,127 +106,205 @@ class AndroidEmulatorManager(EmulatorManager):
         """
         self.avd, self.port = avd, port
         self.proc: subprocess.Popen[Any] | None = None
+        self._shell_proc: subprocess.Popen[str] | None = None
+        # Output lines of the current shell session (None marks its end), fed by a thread
+        self._shell_lines: queue.Queue[str | None] | None = None
+        self._output: deque[str] = deque(maxlen=_OUTPUT_MAX_LINES)
+        self._output_thread: threading.Thread | None = None
+        self._boot_evt = threading.Event()
         self._log = get_logger(__name__)
 
     def start(self) -> None:
         """
         Start the Android emulator process in a separate subprocess.
 
-        Spawns the emulator with the specified AVD name and port.
+        Spawns the emulator with the specified AVD name and port. Its console output
+        is drained by a background thread into a bounded buffer, so a chatty emulator
+        never blocks on a full pipe nor mixes its lines into test output.
         """
-        # Extra flags for stable startup and CI environments
-        cmd = [
-            "emulator",
-            "-avd",
-            self.avd,
-            "-port",
-            str(self.port),
-            "-no-boot-anim",
-            "-no-snapshot-load",
-            "-no-audio",
-        ]
-        # Headless mode for CI/headless environments
-        try:
-            import os
-
-            if os.getenv("CI") == "true" or os.getenv("HEADLESS") == "1":
-                cmd.append("-no-window")
-        except Exception:
-            # Safely ignore any environment variable issues
-            pass
+        base = _EMULATOR_BASE_HEADLESS if _HEADLESS else _EMULATOR_BASE
+        cmd = [*base, "-avd", self.avd, "-port", str(self.port)]
 
-        # Log emulator startup
-        try:
-            self._log.info(
-                "Starting Android emulator",
-                action="emulator_start",
-                avd=self.avd,
-                port=self.port,
-                cmd=" ".join(cmd),
-            )
-        except Exception:
-            pass
+        self._log.info(
+            "Starting Android emulator",
+            action="emulator_start",
+            avd=self.avd,
+            port=self.port,
+            cmd=" ".join(cmd),
+        )
 
+        self._boot_evt.clear()
         self.proc = cast(
             subprocess.Popen[Any],
-            run_cmd(cmd, spawn=True),
+            run_cmd(cmd, spawn=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT),
         )
-
-        # Log successful process start
-        try:
-            self._log.info(
-                "Emulator process started",
-                action="emulator_started",
-                avd=self.avd,
-                port=self.port,
-                pid=getattr(self.proc, "pid", None),
+        stream = getattr(self.proc, "stdout", None)
+        if stream is not None:
+            self._output_thread = threading.Thread(
+                target=self._drain_output,
+                args=(stream,),
+                name=f"emulator-{self.port}-output",
+                daemon=True,
             )
-        except Exception:
-            pass
+            self._output_thread.start()
+
+        self._log.info(
+            "Emulator process started",
+            action="emulator_started",
+            avd=self.avd,
+            port=self.port,
+            pid=getattr(self.proc, "pid", None),
+        )
 
     def wait_until_ready(self, timeout: int = 180) -> None:
         """
         Wait until the emulator is fully booted and ready.
 
+        A successful check is remembered for a few seconds, so repeated calls for the
+        same emulator return immediately.
+
         Args:
             timeout (int): Max wait time in seconds. Default is 180 seconds.
 
         Raises:
             TimeoutError: If the emulator does not report `sys.boot_completed=1` within the timeout.
         """
-        # Log waiting for readiness
+        serial = f"emulator-{self.port}"
+        if time.monotonic() - _ready_cache.get(serial, float("-inf")) < _READY_CACHE_TTL_S:
+            return
+
+        # Fast path: the emulator already reported boot on its console, or one short-lived
+        # probe answers for an already-booted emulator without opening the shell session
+        ready = self._boot_evt.is_set()
+        if not ready:
+            cmd = ["adb", "-s", serial, "shell", _BOOT_PROBE]
+            ready = _boot_completed(cast(Completed, run_cmd(cmd, check=False)).stdout)
+
+        # Probe often right after boot may have completed, then back off to spare adb
+        interval = _READY_POLL_INITIAL_S
+        t0 = time.time()
         try:
+            while not ready and time.time() - t0 < timeout:
+                ready = self._pause_until_boot_marker(interval)
+                interval = min(interval * 1.5, _READY_POLL_MAX_S)
+                if not ready:
+                    # Never let one probe outlast the overall deadline
+                    remaining = max(timeout - (time.time() - t0), 0.1)
+                    probe = self._shell(_BOOT_PROBE, timeout=min(remaining, _SHELL_READ_TIMEOUT_S))
+                    ready = _boot_completed(probe)
+        finally:
+            self._close_shell()
+        if ready:
+            _ready_cache[serial] = time.monotonic()
             self._log.info(
-                "Waiting for emulator readiness",
-                action="emulator_wait_ready",
-                avd=self.avd,
-                port=self.port,
-                timeout=timeout,
+                "Emulator is ready", action="emulator_ready", avd=self.avd, port=self.port
             )
-        except Exception:
+            return
+        self._log.error(
+            "Emulator did not become ready within the timeout",
+            action="emulator_ready_timeout",
+            avd=self.avd,
+            port=self.port,
+            timeout=timeout,
+            output_tail=list(self._output)[-20:],
+        )
+        raise TimeoutError("Android emulator did not become ready within the timeout")
+
+    def _drain_output(self, stream: Iterable[bytes]) -> None:
+        """Read emulator console lines into the bounded buffer; flag the boot marker."""
+        try:
+            for raw in stream:
+                line = raw.decode(errors="replace").rstrip()
+                self._output.append(line)
+                if _BOOT_MARKER in line.lower():
+                    self._boot_evt.set()
+        except (OSError, ValueError):
+            # Stream closed while the emulator was being stopped
             pass
 
-        t0 = time.time()
-        while time.time() - t0 < timeout:
-            out = run_cmd(
-                [
-                    "adb",
-                    "-s",
-                    f"emulator-{self.port}",
-                    "shell",
-                    "getprop",
-                    "sys.boot_completed",
-                ],
-                check=False,
+    def _pause_until_boot_marker(self, seconds: float) -> bool:
+        """
+        Sleep between boot probes.
+
+        While the emulator console is being drained, wakes up early and returns True
+        as soon as the emulator reports that boot completed.
+        """
+        if self._output_thread is None:
+            time.sleep(seconds)
+            return False
+        return self._boot_evt.wait(seconds)
+
+    def _shell(self, command: str, timeout: float = _SHELL_READ_TIMEOUT_S) -> str:
+        """
+        Run a command on the emulator through a persistent `adb shell` session.
+
+        The session is started on first use and reused, so repeated probes do not
+        spawn an adb process each. Output is framed by sentinel lines and read by a
+        background thread, so a wedged session cannot block the caller. Returns ""
+        if the session ended (e.g. the device is not online yet) or produced no
+        complete output within `timeout` seconds; the next call starts a new one.
+        """
+        proc, lines_q = self._shell_proc, self._shell_lines
+        if proc is None or lines_q is None or proc.poll() is not None:
+            self._close_shell()
+            proc = subprocess.Popen(
+                ["adb", "-s", f"emulator-{self.port}", "shell"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
             )
-            stdout = out.stdout
-            if isinstance(stdout, bytes | bytearray):
-                text = stdout.decode(errors="ignore")
-            else:
-                text = str(stdout or "")
-            if text.strip() == "1":
-                try:
-                    self._log.info(
-                        "Emulator is ready",
-                        action="emulator_ready",
-                        avd=self.avd,
-                        port=self.port,
-                    )
-                except Exception:
-                    pass
-                return
-            time.sleep(2)
+            lines_q = queue.Queue()
+            threading.Thread(
+                target=_read_lines,
+                args=(proc.stdout, lines_q),
+                name=f"emulator-{self.port}-shell",
+                daemon=True,
+            ).start()
+            self._shell_proc, self._shell_lines = proc, lines_q
+        assert proc.stdin is not None
+        deadline = time.monotonic() + timeout
         try:
-            self._log.error(
-                "Emulator did not become ready within the timeout",
-                action="emulator_ready_timeout",
-                avd=self.avd,
+            proc.stdin.write(f"echo {_SHELL_BEGIN}; {command}; echo {_SHELL_END}\n")
+            proc.stdin.flush()
+            lines: list[str] = []
+            started = False
+            while True:
+                line = lines_q.get(timeout=max(deadline - time.monotonic(), 0))
+                if line is None:
+                    break
+                if line == _SHELL_END:
+                    return "\n".join(lines)
+                if started:
+                    lines.append(line)
+                elif line == _SHELL_BEGIN:
+                    started = True
+        except queue.Empty:
+            self._log.warning(
+                "adb shell session timed out; restarting it",
+                action="emulator_shell_timeout",
                 port=self.port,
                 timeout=timeout,
             )
+        except (OSError, ValueError):
+            pass
+        # EOF, broken pipe or timeout: the session is gone or unusable
+        self._close_shell()
+        return ""
+
+    def _close_shell(self) -> None:
+        """Close the persistent `adb shell` session, if any."""
+        proc, self._shell_proc = self._shell_proc, None
+        self._shell_lines = None
+        if proc is None:
+            return
+        try:
+            if proc.stdin is not None:
+                proc.stdin.close()
+            proc.terminate()
+            proc.wait(timeout=2)
         except Exception:
             pass
-        raise TimeoutError("Android emulator did not become ready within the timeout")
 
     def _adb(
         self, *args: str, capture_output: bool = False, timeout: int = 20
@@ -162,7 +317,9 @@ class AndroidEmulatorManager(EmulatorManager):
         if udid is not None:
             base += ["-s", str(udid)]
         cmd = base + list(args)
-        self._log.debug("ADB: %s", " ".join(map(shlex.quote, cmd)))
+        # Quoting every argument is only worth it when the record is not dropped
+        if is_enabled_for(logging.DEBUG):
+            self._log.debug("ADB: %s", " ".join(map(shlex.quote, cmd)))
         try:
             if capture_output:
                 return subprocess.run(
@@ -174,6 +331,16 @@ class AndroidEmulatorManager(EmulatorManager):
             self._log.warning("ADB timeout: %s", e)
             return subprocess.CompletedProcess(cmd, 124, stdout="", stderr="timeout")
 
+    def _adb_line(self, *args: str, timeout: int = 20) -> str | None:
+        """
+        Run a single-line adb probe (getprop, settings get) and return its first
+        output line, stripped. Returns None if adb failed or timed out.
+        """
+        res = self._adb(*args, capture_output=True, timeout=timeout)
+        if res.returncode != 0:
+            return None
+        return (res.stdout or "").partition("\n")[0].strip()
+
     def apply_proxy(self, host: str, port: int) -> None:
         """
         Set system proxy in the emulator via `settings put global http_proxy`.
@@ -184,37 +351,38 @@ class AndroidEmulatorManager(EmulatorManager):
         """
         target = getattr(self, "udid", None) or f"emulator-{self.port}"
 
-        # 1) Wait for early ADB transport (before full OS boot):
-        #    appearance in `adb devices` + shell responsiveness.
-        import subprocess
-        import time
-
-        start_ts = time.time()
+        # 1) Wait for early ADB transport (before full OS boot): `wait-for-device`
+        #    blocks inside the adb server until the target is online, without polling.
         adb_timeout = 60  # seconds, to avoid hanging forever during early wait
-        while time.time() - start_ts < adb_timeout:
-            try:
-                lst = subprocess.run(
-                    ["adb", "devices"], capture_output=True, text=True, check=False, timeout=8
-                )
-                if lst.returncode == 0 and target in (lst.stdout or ""):
-                    pong = self._adb("shell", "echo", "ping", capture_output=True)
-                    if pong.returncode == 0 and "ping" in (pong.stdout or ""):
-                        break  # transport is ready
-            except Exception:
-                pass
-            time.sleep(1.0)
-        else:
+        try:
+            subprocess.run(
+                ["adb", "-s", target, "wait-for-device"], check=False, timeout=adb_timeout
+            )
+        except (OSError, subprocess.TimeoutExpired):
             # Transport never came up - log warning and exit gracefully.
             self._log.warning(
                 "ADB transport is not ready - skipping early proxy application (target=%s)", target
             )
             return
+        # Sanity check that the shell responds on the now-online transport
+        if self._adb_line("shell", "getprop", "sys.boot_completed") is None:
+            self._log.warning(
+                "ADB shell is not responding - skipping early proxy application (target=%s)",
+                target,
+            )
+            return
 
-        # 2) Try to set system proxy with several retries:
-        cmd = ["shell", "settings", "put", "global", "http_proxy", f"{host}:{port}"]
+        # 2) Set and read back the system proxy in one adb shell call, with several retries.
+        #    A put that succeeded but is not visible yet is re-read briefly instead of
+        #    sleeping a fixed time for SettingsProvider to propagate it.
+        value = f"{host}:{port}"
+        script = f"settings put global http_proxy {value}; settings get global http_proxy"
         for attempt in range(1, 6):  # up to 5 attempts
-            res = self._adb(*cmd, capture_output=True)
-            if res.returncode == 0:
+            res = self._adb("shell", script, capture_output=True)
+            applied = res.returncode == 0 and value in (res.stdout or "")
+            if res.returncode == 0 and not applied:
+                applied = self._await_proxy_value(value)
+            if applied:
                 self._log.info(
                     "http_proxy set in emulator: %s:%s (attempt=%d)", host, port, attempt
                 )
@@ -232,8 +400,17 @@ class AndroidEmulatorManager(EmulatorManager):
                 "Failed to apply http_proxy after 5 attempts - continuing without it."
             )
 
-        # 3) Short pause for SettingsProvider to propagate new value.
-        time.sleep(0.5)
+    def _await_proxy_value(self, value: str) -> bool:
+        """
+        Re-read `global http_proxy` a few times at a short interval.
+
+        Returns True as soon as it equals `value`, False if it never does.
+        """
+        for _ in range(_PROXY_SETTLE_POLLS):
+            time.sleep(_PROXY_SETTLE_POLL_S)
+            if self._adb_line("shell", "settings", "get", "global", "http_proxy") == value:
+                return True
+        return False
 
     def remove_proxy(self) -> None:
         """
@@ -283,35 +460,36 @@ class AndroidEmulatorManager(EmulatorManager):
                 self._log.warning("Failed to remount system: %s", rem.stderr or rem.stdout)
                 # Without remount we cannot write to /system
                 return
-            # Build file name (Android expects hash-based file names; simplified as .der here)
-            # For production: use `openssl x509 -hash` to generate proper name.
+            # Android looks up system CAs by `<subject_hash_old>.0` and reads DER
+            try:
+                cert = x509.load_pem_x509_certificate(cert_path.read_bytes())
+            except ValueError:
+                self._log.warning("Failed to parse CA certificate, skipping CA installation.")
+                return
+            name = f"{_subject_hash_old(cert)}.0"
             with tempfile.TemporaryDirectory() as _td:
-                tmp_dir = Path(_td)
-                # Convert PEM to DER (Android expects DER)
-                der = tmp_dir / "mitmproxy-ca-cert.der"
-                # openssl required
-                subprocess.run(
-                    ["openssl", "x509", "-in", str(cert_path), "-outform", "der", "-out", str(der)],
-                    check=False,
-                )
-                if not der.exists():
-                    self._log.warning("Failed to convert cert to DER, skipping CA installation.")
-                    return
+                der = Path(_td) / name
+                der.write_bytes(cert.public_bytes(serialization.Encoding.DER))
                 # Push to /system/etc/security/cacerts/
-                target = "/system/etc/security/cacerts/mitmproxy-ca-cert.der"
+                target = f"/system/etc/security/cacerts/{name}"
                 push = self._adb("push", str(der), target, capture_output=True)
                 if push.returncode != 0:
                     self._log.warning("Failed to push CA: %s", push.stderr or push.stdout)
                     return
-                # Set permissions
-                self._adb("shell", "chmod", "644", target)
-                self._adb("shell", "chown", "root:root", target)
+                # Set permissions and owner in one adb shell call
+                self._adb(
+                    "shell", f"chmod 644 {target}; chown root:root {target}", capture_output=True
+                )
                 self._log.info(
                     "mitmproxy CA successfully installed to %s (emulator reboot required).",
                     target,
                 )
-                # Reboot emulator so system reloads CA store
+                # Reboot emulator so system reloads CA store; the console reports
+                # boot completion again once it is back up
+                self._boot_evt.clear()
                 self._adb("reboot")
+                # A readiness check from before the reboot no longer holds
+                _ready_cache.pop(f"emulator-{self.port}", None)
                 self._log.info("Emulator rebooted to apply CA.")
         except Exception as e:
             self._log.exception("Error while attempting to install mitm CA into emulator: %s", e)
@@ -321,7 +499,9 @@ class AndroidEmulatorManager(EmulatorManager):
         """
         Stop the running emulator instance.
 
-        Sends `emu kill` via ADB. Safe to call even if emulator is already stopped.
+        Terminates the emulator process started by `start()`, killing it if it does not
+        exit in time. For an emulator started elsewhere, sends `emu kill` via ADB.
+        Safe to call even if emulator is already stopped.
         """
         try:
             self._log.info(
@@ -332,4 +512,16 @@ class AndroidEmulatorManager(EmulatorManager):
             )
         except Exception:
             pass
-        run_cmd(["adb", "-s", f"emulator-{self.port}", "emu", "kill"], check=False)
+        self._close_shell()
+        _ready_cache.pop(f"emulator-{self.port}", None)
+        proc = self.proc
+        if proc is None:
+            run_cmd(["adb", "-s", f"emulator-{self.port}", "emu", "kill"], check=False)
+            return
+        if proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
@@ -1,28 +1,50 @@
 from __future__ import annotations
 
+import atexit
 import json
+import logging
 import os
+import random
+import shutil
+import subprocess
 import threading
 import time
 from dataclasses import dataclass
-from urllib.error import URLError
+from typing import cast
 from urllib.parse import urlparse
-from urllib.request import Request, urlopen
 
 import structlog
+import urllib3
 
 from ..config.models import Settings
 from ..utils.cli import run_cmd
+from ..utils.logging import is_enabled_for
+
+
+# Keep-alive connections to the local Appium server, shared by all health probes
+_http = urllib3.PoolManager(
+    num_pools=1,
+    maxsize=2,
+    headers={"Accept": "application/json"},
+    timeout=urllib3.Timeout(connect=1, read=3),
+)
+atexit.register(_http.clear)
+
+
+def _jittered(delay: float) -> float:
+    """Add up to 20% random jitter so several managers do not probe in lockstep."""
+    return delay + random.uniform(0, 0.2 * delay)
 
 
 @dataclass(slots=True)
 class _State:
     """Helper structure for storing Appium process state."""
 
-    proc: object | None = None  # subprocess.Popen | None
+    proc: subprocess.Popen | None = None  # Appium process, if started by this manager
     started_by_us: bool = False  # Whether the server was started by this manager
-    shutting_down: bool = False  # Shutdown flag
     monitor_thread: threading.Thread | None = None  # Monitoring thread
+    host: str | None = None  # Host parsed from the target URL
+    port: int | None = None  # Port parsed from the target URL
 
 
 class AppiumServerManager:
@@ -31,19 +53,25 @@ class AppiumServerManager:
 
     Features:
     - Automatically starts Appium before all tests (using host/port from Settings.appium.url)
-    - Checks server readiness via /status (and compatible endpoints)
+    - Checks server readiness via /status (GET /sessions where HEAD is not allowed)
     - Monitors server health and automatically restarts it on failure
     - Gracefully terminates the process after all tests (if started by this manager)
     """
 
     DEFAULT_POLL_INTERVAL_SEC = 3.0  # Interval between health checks (seconds)
+    MAX_POLL_INTERVAL_SEC = 30.0  # Cap for the interval while the server stays healthy
+    STARTUP_POLL_INITIAL_SEC = 0.1  # First interval while waiting for startup
+    STARTUP_POLL_MAX_SEC = 2.0  # Cap for the startup interval (doubles per probe)
     FAILURE_THRESHOLD = 3  # Consecutive failed checks before restart
     START_TIMEOUT_SEC = 30  # Max time to wait for server startup
+    SHUTDOWN_JOIN_TIMEOUT_SEC = 5.0  # Max time shutdown waits for the monitor thread
 
     def __init__(self) -> None:
         self._log = structlog.get_logger(__name__)
         self._state = _State()
         self._lock = threading.RLock()
+        self._stop = threading.Event()  # Set on shutdown; wakes the monitor loop at once
+        self._need_check = threading.Event()  # Set by report_failure/shutdown; wakes the monitor
         self._target_url: str | None = None
 
     # ------------------------
@@ -57,8 +85,15 @@ class AppiumServerManager:
         Safe to call multiple times.
         """
         with self._lock:
+            # A monitor left running by a timed-out shutdown must be gone before restarting
+            if self._stop.is_set() and not self._join_monitor(
+                timeout=self.SHUTDOWN_JOIN_TIMEOUT_SEC
+            ):
+                raise RuntimeError("The previous Appium monitor thread is still stopping")
             url = str(settings.appium.url).rstrip("/")
             self._target_url = url
+            host, port = self._parse_host_port(url)
+            self._state.host, self._state.port = host, port
 
             # Check if an Appium server is already up
             if self._is_healthy(url):
@@ -72,47 +107,38 @@ class AppiumServerManager:
                 return
 
             # Server is not available - try to start it
-            host, port = self._parse_host_port(url)
             self._start_process(host, port)
             self._wait_until_healthy(url, timeout=self.START_TIMEOUT_SEC)
             self._start_monitoring(url)
 
+    def report_failure(self) -> None:
+        """
+        Ask the monitor to probe the server now instead of at its next scheduled check.
+
+        Meant for callers that have just seen a driver-level error; cheap and safe to call
+        from any thread, whether or not monitoring is running.
+        """
+        self._need_check.set()
+
     def shutdown(self) -> None:
         """
         Stop monitoring and gracefully terminate the Appium process,
         if it was started by this manager.
         """
         with self._lock:
-            self._state.shutting_down = True
-            try:
-                if self._state.monitor_thread and self._state.monitor_thread.is_alive():
-                    # Monitoring thread is daemonized; nothing special to do here.
-                    pass
-            finally:
-                pass
+            self._stop.set()
+            self._need_check.set()
+            # The loop wakes at once; only an in-flight probe can delay it
+            if not self._join_monitor(timeout=self.SHUTDOWN_JOIN_TIMEOUT_SEC):
+                self._log.warning("Appium monitor did not stop in time - left flagged to exit")
 
             if self._state.started_by_us:
                 p = self._state.proc
                 self._state.proc = None
-                if p is not None and getattr(p, "poll", lambda: None)() is None:
-                    # Process is still running - terminate
+                if p is not None and p.poll() is None:
+                    # Process is still running - terminate, waiting up to 5 seconds
                     self._log.info("Stopping Appium server (started by framework)")
-                    try:
-                        getattr(p, "terminate", lambda: None)()
-                    except Exception:
-                        pass
-
-                    # Wait up to 5 seconds for graceful shutdown
-                    deadline = time.time() + 5
-                    while time.time() < deadline and getattr(p, "poll", lambda: 0)() is None:
-                        time.sleep(0.1)
-
-                    if getattr(p, "poll", lambda: 0)() is None:
-                        self._log.warning("Appium did not stop in time - forcing process kill")
-                        try:
-                            getattr(p, "kill", lambda: None)()
-                        except Exception:
-                            pass
+                    self._terminate(p, grace=5)
             else:
                 self._log.info(
                     "Appium was not started by framework - leaving process running",
@@ -120,11 +146,28 @@ class AppiumServerManager:
                 )
 
             self._state.started_by_us = False
-            self._state.shutting_down = False
 
     # ------------------------
     # Helper methods
     # ------------------------
+    def _join_monitor(self, *, timeout: float) -> bool:
+        """
+        Wait for the monitor thread to exit after a stop request, then re-arm the events.
+
+        Returns False, leaving the stop/check events set so the thread still exits (and
+        never restarts Appium) as soon as it can, if it is running after `timeout` seconds.
+        """
+        t = self._state.monitor_thread
+        if t is not None and t.is_alive():
+            if t is not threading.current_thread():
+                t.join(timeout=timeout)
+            if t.is_alive():
+                return False
+        self._state.monitor_thread = None
+        self._stop.clear()
+        self._need_check.clear()
+        return True
+
     def _parse_host_port(self, base_url: str) -> tuple[str, int]:
         """Extract host and port from Appium server URL."""
         pr = urlparse(base_url)
@@ -134,62 +177,83 @@ class AppiumServerManager:
 
     def _is_healthy(self, base_url: str) -> bool:
         """
-        Check that Appium server responds with 2xx on one of the known endpoints.
+        Check that Appium server answers `/status` with a 2xx/3xx status.
 
-        Used to validate availability (/status, /sessions, /).
+        Sends a bodiless HEAD over a pooled keep-alive connection; servers that reject
+        HEAD (405) are probed with GET /sessions instead. The status body is only
+        fetched and parsed when DEBUG logging is enabled, to log the readiness flag.
         """
         base = base_url.rstrip("/")
-        for ep in ("/status", "/sessions", "/"):
-            url = base + ep
+        debug = is_enabled_for(logging.DEBUG)
+        try:
+            resp = _http.request("GET" if debug else "HEAD", base + "/status", retries=False)
+            if resp.status == 405:
+                resp = _http.request("GET", base + "/sessions", retries=False)
+        except Exception:
+            # Connection refused/reset, timeouts: the server is not healthy
+            return False
+        if not 200 <= resp.status < 400:
+            return False
+        if debug and resp.data:
             try:
-                req = Request(url, headers={"Accept": "application/json"})
-                with urlopen(req, timeout=3) as resp:  # nosec - controlled URL
-                    code = resp.getcode() or 0
-                    if 200 <= code < 300:
-                        # Try to parse JSON from /status for readiness logging
-                        try:
-                            raw = resp.read() or b""
-                            if raw:
-                                data = json.loads(raw.decode("utf-8", errors="ignore"))
-                                ready = (
-                                    isinstance(data, dict)
-                                    and isinstance(data.get("value"), dict)
-                                    and bool(data["value"].get("ready", True))
-                                )
-                                self._log.debug(
-                                    "Appium status check",
-                                    endpoint=ep,
-                                    ready=ready,
-                                )
-                        except Exception:
-                            # JSON errors are non-critical; 2xx is enough
-                            pass
-                        return True
-            except URLError:
-                continue
+                data = json.loads(resp.data.decode("utf-8", errors="ignore"))
+                ready = (
+                    isinstance(data, dict)
+                    and isinstance(data.get("value"), dict)
+                    and bool(data["value"].get("ready", True))
+                )
+                self._log.debug("Appium status check", ready=ready)
             except Exception:
-                continue
-        return False
+                # JSON errors are non-critical; the status code is enough
+                pass
+        return True
 
     def _wait_until_healthy(self, url: str, *, timeout: int) -> None:
-        """Wait until Appium becomes healthy within the given timeout."""
+        """
+        Wait until Appium becomes healthy within the given timeout.
+
+        Returns early, without raising, if shutdown was requested meanwhile.
+        """
         deadline = time.time() + timeout
+        delay = self.STARTUP_POLL_INITIAL_SEC
         while time.time() < deadline:
             if self._is_healthy(url):
                 self._log.info("Appium is ready to use", url=url)
                 return
-            time.sleep(0.5)
+            if self._stop.wait(_jittered(delay)):
+                return
+            delay = min(delay * 2, self.STARTUP_POLL_MAX_SEC)
 
         # If server never became healthy - kill the process to avoid "zombie"
         if self._state.started_by_us and self._state.proc is not None:
             try:
-                getattr(self._state.proc, "kill", lambda: None)()
+                self._state.proc.kill()
             except Exception:
                 pass
         raise RuntimeError(f"Failed to start Appium at {url} within {timeout} seconds")
 
+    def _terminate(self, p: subprocess.Popen, *, grace: float) -> None:
+        """
+        Terminate the process and wait for it to exit.
+
+        Blocks in Popen.wait (no polling); kills the process if it is still running
+        after `grace` seconds.
+        """
+        try:
+            p.terminate()
+            p.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            self._log.warning("Appium did not stop in time - forcing process kill")
+            try:
+                p.kill()
+                p.wait()
+            except Exception:
+                pass
+        except Exception:
+            pass
+
     def _shell_prefix(self) -> list[str]:
-        """Return the system command prefix used to start Appium (bash/cmd)."""
+        """Return the shell prefix used when `appium` is not on PATH (bash/cmd)."""
         if os.name == "nt":
             return ["cmd", "/c"]
         return ["bash", "-lc"]
@@ -207,12 +271,21 @@ class AppiumServerManager:
             pass
         log_file = os.path.join(log_dir, "appium-server.log")
 
-        # Start Appium process via `exec` -
-        # this ensures terminate/kill signals are delivered directly to Appium
-        # and the process exits correctly on shutdown.
-        cmd = f"exec appium --address {host} --port {port} >> {log_file} 2>&1"
-        args = self._shell_prefix() + [cmd]
-        p = run_cmd(args, spawn=True)
+        # Start Appium directly, appending its output to the log file: no shell startup
+        # cost, and terminate/kill signals reach Appium itself. The child keeps its own
+        # copy of the file descriptor, so the parent's handle is closed right away.
+        appium = shutil.which("appium")
+        with open(log_file, "ab", buffering=0) as log_fh:
+            if appium is not None:
+                args = [appium, "--address", host, "--port", str(port)]
+            else:
+                # Not on this process's PATH (e.g. installed via nvm): let the login
+                # shell resolve it, with `exec` so signals still reach Appium
+                args = self._shell_prefix() + [f"exec appium --address {host} --port {port}"]
+            p = cast(
+                subprocess.Popen,
+                run_cmd(args, spawn=True, stdout=log_fh, stderr=subprocess.STDOUT),
+            )
         self._state.proc = p
         self._state.started_by_us = True
 
@@ -233,60 +306,76 @@ class AppiumServerManager:
         self._state.monitor_thread = t
         t.start()
 
+    def _pause(self, delay: float) -> bool:
+        """
+        Sleep up to `delay` seconds between monitor checks.
+
+        Wakes early on report_failure() or shutdown; returns True if shutdown was requested.
+        """
+        self._need_check.wait(_jittered(delay))
+        self._need_check.clear()
+        return self._stop.is_set()
+
     def _monitor_loop(self, url: str) -> None:
         """
         Background monitoring loop for Appium:
 
         - Checks process liveness and /status endpoint.
         - Restarts the server after repeated failures.
+        - Checks immediately when report_failure() is called, instead of waiting out
+          the current interval.
+        - Probes less often while the server stays healthy (x1.5 per healthy check,
+          capped at MAX_POLL_INTERVAL_SEC); any failure or restart resets the interval.
         """
         failures = 0
-        while not self._state.shutting_down:
+        delay = self.DEFAULT_POLL_INTERVAL_SEC
+        while not self._stop.is_set():
             try:
-                alive = False
                 p = self._state.proc
-                if p is not None:
-                    alive = getattr(p, "poll", lambda: None)() is None
+                alive = p is not None and p.poll() is None
 
                 healthy = self._is_healthy(url)
                 if not alive or not healthy:
                     failures += 1
+                    delay = self.DEFAULT_POLL_INTERVAL_SEC
                 else:
                     failures = 0
+                    delay = min(delay * 1.5, self.MAX_POLL_INTERVAL_SEC)
 
-                if failures >= self.FAILURE_THRESHOLD and not self._state.shutting_down:
+                if failures >= self.FAILURE_THRESHOLD and not self._stop.is_set():
                     self._log.warning(
                         "Appium health issues detected - restarting server",
                         failures=failures,
                     )
                     # Stop current process
                     if p is not None:
-                        try:
-                            getattr(p, "terminate", lambda: None)()
-                        except Exception:
-                            pass
-                        deadline = time.time() + 3
-                        while time.time() < deadline and getattr(p, "poll", lambda: 0)() is None:
-                            time.sleep(0.1)
-                        if getattr(p, "poll", lambda: 0)() is None:
-                            try:
-                                getattr(p, "kill", lambda: None)()
-                            except Exception:
-                                pass
-
-                    # Restart Appium
-                    host, port = self._parse_host_port(url)
+                        self._terminate(p, grace=3)
+
+                    # Restart Appium on the host/port parsed when monitoring started
+                    host, port = self._state.host, self._state.port
+                    if host is None or port is None:
+                        host, port = self._parse_host_port(url)
                     try:
                         self._start_process(host, port)
                         self._wait_until_healthy(url, timeout=self.START_TIMEOUT_SEC)
                         failures = 0
                     except Exception as e:
                         self._log.error("Failed to restart Appium", error=str(e))
-                time.sleep(self.DEFAULT_POLL_INTERVAL_SEC)
+                    if self._stop.is_set():
+                        # Shutdown raced the restart: do not leave the new server behind
+                        p, self._state.proc = self._state.proc, None
+                        if p is not None:
+                            self._terminate(p, grace=3)
+                        return
+                    delay = self.DEFAULT_POLL_INTERVAL_SEC
+                if self._pause(delay):
+                    return
             except Exception as e:
                 # Never silently exit the monitoring loop
                 self._log.error("Error in monitoring loop", error=str(e))
-                time.sleep(self.DEFAULT_POLL_INTERVAL_SEC)
+                delay = self.DEFAULT_POLL_INTERVAL_SEC
+                if self._pause(delay):
+                    return
 
 
 # Global instance for convenient usage in fixtures
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 
 
@@ -9,6 +10,9 @@ class EmulatorManager(ABC):
 
     Defines the required interface to start, stop,
     and wait for readiness for any emulator implementation.
+
+    The `*_async` variants run the blocking methods in a worker thread, so async
+    orchestrators can manage several devices concurrently without stalling their loop.
     """
 
     @abstractmethod
@@ -39,3 +43,20 @@ class EmulatorManager(ABC):
             timeout (int): Maximum wait time in seconds (default: 120).
         """
         ...
+
+    async def start_async(self) -> None:
+        """Run `start()` in a worker thread."""
+        await asyncio.to_thread(self.start)
+
+    async def stop_async(self) -> None:
+        """Run `stop()` in a worker thread."""
+        await asyncio.to_thread(self.stop)
+
+    async def wait_until_ready_async(self, timeout: int = 120) -> None:
+        """
+        Run `wait_until_ready(timeout)` in a worker thread.
+
+        Args:
+            timeout (int): Maximum wait time in seconds (default: 120).
+        """
+        await asyncio.to_thread(self.wait_until_ready, timeout)
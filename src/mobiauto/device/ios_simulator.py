@@ -1,15 +1,37 @@
 from __future__ import annotations
 
+import functools
 import json
+import plistlib
+import re
 import subprocess
 import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, cast
+from typing import Any, ClassVar, cast
 
-from ..utils.cli import run_cmd
+from ..utils.cli import Completed, run_cmd
 from ..utils.logging import get_logger
 from .base import EmulatorManager
 
+# How long a `simctl list` result is reused by find_simulator_udid_by_name (seconds)
+_SIMCTL_LIST_TTL_S = 5
+
+# How long the macOS network service list is reused before asking networksetup again
+_SERVICES_TTL_S = 30.0
+
+# CoreSimulator's per-device data directory and the device.plist state value for "Booted"
+_CORESIM_DEVICES_DIR = Path.home() / "Library" / "Developer" / "CoreSimulator" / "Devices"
+_PLIST_STATE_BOOTED = 3
+
+# Readiness fallback polling: first interval and cap (seconds), doubling per probe
+_READY_POLL_INITIAL_S = 0.05
+_READY_POLL_MAX_S = 2.0
+
+# How long a `sudo -n true` result is trusted (well within sudo's 5-minute credential cache)
+_SUDO_PROBE_TTL_S = 60.0
+
 
 class IOSSimulatorManager(EmulatorManager):
     """
@@ -18,6 +40,9 @@ class IOSSimulatorManager(EmulatorManager):
     Provides methods to boot, wait for readiness, and shut down the simulator.
     """
 
+    # Last `sudo -n true` result as (monotonic ts, ok); shared, sudo credentials are per user
+    _sudo_ok_cache: ClassVar[tuple[float, bool] | None] = None
+
     def __init__(self, udid: str) -> None:
         """
         Initialize IOSSimulatorManager.
@@ -26,6 +51,7 @@ class IOSSimulatorManager(EmulatorManager):
             udid (str): UDID of the iOS simulator to manage.
         """
         self.udid = udid
+        self._services_cache: tuple[float, list[str]] | None = None  # (monotonic ts, services)
         self._log = get_logger(__name__)
 
     def start(self) -> None:
@@ -34,23 +60,17 @@ class IOSSimulatorManager(EmulatorManager):
 
         Uses `xcrun simctl boot` to start the simulator.
         """
-        try:
-            self._log.info(
-                "Starting iOS simulator",
-                action="simulator_start",
-                udid=self.udid,
-            )
-        except Exception:
-            pass
-        run_cmd(["xcrun", "simctl", "boot", self.udid], check=False)
-        try:
-            self._log.info(
-                "Simulator boot command issued",
-                action="simulator_started",
-                udid=self.udid,
-            )
-        except Exception:
-            pass
+        self._log.info(
+            "Starting iOS simulator",
+            action="simulator_start",
+            udid=self.udid,
+        )
+        run_cmd(["xcrun", "simctl", "boot", self.udid], check=False, capture_output=False)
+        self._log.info(
+            "Simulator boot command issued",
+            action="simulator_started",
+            udid=self.udid,
+        )
 
     def wait_until_ready(self, timeout: int = 120) -> None:
         """
@@ -62,55 +82,120 @@ class IOSSimulatorManager(EmulatorManager):
         Raises:
             TimeoutError: If the simulator is not ready within the given timeout.
         """
-        try:
-            self._log.info(
-                "Waiting for simulator readiness",
-                action="simulator_wait_ready",
-                udid=self.udid,
-                timeout=timeout,
-            )
-        except Exception:
-            pass
+        self._log.info(
+            "Waiting for simulator readiness",
+            action="simulator_wait_ready",
+            udid=self.udid,
+            timeout=timeout,
+        )
         t0 = time.time()
-        while time.time() - t0 < timeout:
-            out = run_cmd(
-                ["xcrun", "simctl", "spawn", self.udid, "launchctl", "print", "system"],
-                check=False,
-            )
-            if out.returncode == 0:
-                try:
-                    self._log.info(
-                        "Simulator is ready",
-                        action="simulator_ready",
-                        udid=self.udid,
-                    )
-                except Exception:
-                    pass
-                return
-            time.sleep(2)
+        # `bootstatus -b` blocks until boot has finished (booting if needed): no polling
         try:
-            self._log.error(
-                "Simulator did not become ready within the timeout",
-                action="simulator_ready_timeout",
+            out = cast(
+                Completed,
+                run_cmd(
+                    ["xcrun", "simctl", "bootstatus", self.udid, "-b"],
+                    check=False,
+                    timeout=timeout,
+                    capture_output=False,  # Only the exit code is used
+                ),
+            )
+            ready = out.returncode == 0
+        except subprocess.TimeoutExpired:
+            ready = False
+        # Fallback for simctl without bootstatus: poll the device state, read from
+        # CoreSimulator's device.plist (no process spawn) or, failing that, from simctl
+        interval = _READY_POLL_INITIAL_S
+        while not ready and time.time() - t0 < timeout:
+            state = self._device_state_from_plist()
+            if state is None:
+                ready = self._device_state() == "Booted"
+            else:
+                ready = state == _PLIST_STATE_BOOTED
+            if not ready:
+                time.sleep(interval)
+                interval = min(interval * 2, _READY_POLL_MAX_S)
+        if ready:
+            self._log.info(
+                "Simulator is ready",
+                action="simulator_ready",
                 udid=self.udid,
-                timeout=timeout,
             )
-        except Exception:
-            pass
+            return
+        self._log.error(
+            "Simulator did not become ready within the timeout",
+            action="simulator_ready_timeout",
+            udid=self.udid,
+            timeout=timeout,
+        )
         raise TimeoutError("iOS Simulator did not become ready within the timeout")
 
-    def _run_netsetup(self, args: list[str], sudo: bool = False) -> subprocess.CompletedProcess:
-        cmd = ["networksetup"] + args
-        if sudo:
-            cmd = ["sudo", "--"] + cmd
-        self._log.debug("networksetup: %s", " ".join(cmd))
+    def _device_state_from_plist(self) -> int | None:
+        """
+        Return the numeric `state` from the simulator's CoreSimulator device.plist.
+
+        3 means Booted. Returns None if the file is missing or unreadable (e.g. a
+        non-default CoreSimulator location), so callers can fall back to simctl.
+        """
         try:
-            return subprocess.run(cmd, capture_output=True, text=True, check=False, timeout=12)
-        except Exception as e:
-            self._log.warning("networksetup failed: %s", e)
-            return subprocess.CompletedProcess(cmd, 1, stdout="", stderr=str(e))
+            with open(_CORESIM_DEVICES_DIR / self.udid / "device.plist", "rb") as f:
+                state = plistlib.load(f).get("state")
+        except (OSError, plistlib.InvalidFileException, ValueError):
+            return None
+        return state if isinstance(state, int) else None
+
+    def _device_state(self) -> str | None:
+        """Return the simulator state from `simctl list -j devices <udid>` (e.g. "Booted")."""
+        out = run_cmd(["xcrun", "simctl", "list", "-j", "devices", self.udid], check=False)
+        try:
+            data = json.loads(getattr(out, "stdout", "") or "{}")
+        except Exception:
+            return None
+        for devs in (data.get("devices") or {}).values():
+            for d in devs:
+                if d.get("udid") == self.udid:
+                    return cast(str | None, d.get("state"))
+        return None
+
+    def _run_netsetup(
+        self, commands: list[list[str]], sudo: bool = False
+    ) -> subprocess.CompletedProcess:
+        """
+        Run `networksetup` invocations one after another, each as its own process.
+
+        Each item of `commands` is the argument list of one invocation; a failing one
+        does not stop the rest. With `sudo`, each runs as `sudo -- networksetup ...`, so
+        a sudoers rule scoped to networksetup is enough. Returns the first failed result,
+        or the last one if all succeeded.
+        """
+        result = subprocess.CompletedProcess(["networksetup"], 0, stdout="", stderr="")
+        failed: subprocess.CompletedProcess | None = None
+        for args in commands:
+            cmd = ["networksetup", *args]
+            if sudo:
+                cmd = ["sudo", "--", *cmd]
+            self._log.debug("networksetup: %s", " ".join(cmd))
+            try:
+                result = subprocess.run(
+                    cmd, capture_output=True, text=True, check=False, timeout=12
+                )
+            except Exception as e:
+                self._log.warning("networksetup failed: %s", e)
+                result = subprocess.CompletedProcess(cmd, 1, stdout="", stderr=str(e))
+            if failed is None and result.returncode != 0:
+                failed = result
+        return failed or result
 
     def _list_macos_services(self) -> list[str]:
+        """
+        Return the macOS network service names.
+
+        A non-empty result is reused for _SERVICES_TTL_S seconds; see
+        _invalidate_services_cache to force a refresh.
+        """
+        cached = self._services_cache
+        if cached is not None and time.monotonic() - cached[0] < _SERVICES_TTL_S:
+            return cached[1]
         try:
             out = subprocess.check_output(
                 ["networksetup", "-listallnetworkservices"], text=True, stderr=subprocess.DEVNULL
@@ -121,9 +206,58 @@ class IOSSimulatorManager(EmulatorManager):
                 if line.strip() and not line.startswith("An asterisk")
             ]
             lines = [line.lstrip("* ").strip() for line in lines if line.strip()]
-            return lines
         except Exception:
             return []
+        if lines:
+            self._services_cache = (time.monotonic(), lines)
+        return lines
+
+    def _invalidate_services_cache(self) -> None:
+        """Forget the cached service list (e.g. after a network interface change)."""
+        self._services_cache = None
+
+    def _netsetup_all(
+        self, services: list[str], commands_for: Callable[[str], list[list[str]]]
+    ) -> None:
+        """
+        Run `commands_for(service)` for every service concurrently, one batch each.
+
+        Services are independent, so their batches run in parallel threads (the work
+        is waiting on subprocesses); failures are logged as they complete.
+        """
+        sudo_ok = self._sudo_available()
+        with ThreadPoolExecutor(max_workers=min(8, len(services))) as pool:
+            futures = {
+                pool.submit(self._run_netsetup, commands_for(svc), sudo_ok): svc
+                for svc in services
+            }
+            for fut in as_completed(futures):
+                res = fut.result()
+                if res.returncode != 0:
+                    self._log.warning(
+                        "networksetup failed for %s: %s", futures[fut], res.stderr or res.stdout
+                    )
+
+    def _sudo_available(self) -> bool:
+        """
+        Return whether passwordless sudo works.
+
+        The probe result is shared by all managers and reused for _SUDO_PROBE_TTL_S
+        seconds, so cached sudo credentials expiring later are still noticed.
+        """
+        cached = IOSSimulatorManager._sudo_ok_cache
+        if cached is not None and time.monotonic() - cached[0] < _SUDO_PROBE_TTL_S:
+            return cached[1]
+        ok = (
+            subprocess.run(
+                ["sudo", "-n", "true"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            ).returncode
+            == 0
+        )
+        IOSSimulatorManager._sudo_ok_cache = (time.monotonic(), ok)
+        return ok
 
     def apply_proxy(self, host: str, port: int) -> None:
         """
@@ -139,40 +273,29 @@ class IOSSimulatorManager(EmulatorManager):
             )
             return
         self._log.info("macOS: setting proxy %s:%s for services: %s", host, port, services)
-        sudo_ok = (
-            subprocess.run(
-                ["sudo", "-n", "true"],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            ).returncode
-            == 0
-        )
-        for svc in services:
-            self._run_netsetup(["-setwebproxy", svc, host, str(port)], sudo=sudo_ok)
-            self._run_netsetup(["-setsecurewebproxy", svc, host, str(port)], sudo=sudo_ok)
-            # Set local bypass
-            self._run_netsetup(
+        self._netsetup_all(
+            services,
+            lambda svc: [
+                ["-setwebproxy", svc, host, str(port)],
+                ["-setsecurewebproxy", svc, host, str(port)],
+                # Set local bypass
                 ["-setproxybypassdomains", svc, "localhost", "127.0.0.1", "::1"],
-                sudo=sudo_ok,
-            )
-            self._run_netsetup(["-setwebproxystate", svc, "on"], sudo=sudo_ok)
-            self._run_netsetup(["-setsecurewebproxystate", svc, "on"], sudo=sudo_ok)
+                ["-setwebproxystate", svc, "on"],
+                ["-setsecurewebproxystate", svc, "on"],
+            ],
+        )
 
     def remove_proxy(self) -> None:
         services = self._list_macos_services()
         if not services:
             return
-        sudo_ok = (
-            subprocess.run(
-                ["sudo", "-n", "true"],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            ).returncode
-            == 0
+        self._netsetup_all(
+            services,
+            lambda svc: [
+                ["-setwebproxystate", svc, "off"],
+                ["-setsecurewebproxystate", svc, "off"],
+            ],
         )
-        for svc in services:
-            self._run_netsetup(["-setwebproxystate", svc, "off"], sudo=sudo_ok)
-            self._run_netsetup(["-setsecurewebproxystate", svc, "off"], sudo=sudo_ok)
 
     def install_mitm_ca_if_available(self, mitm_log_dir: str | None) -> None:
         """
@@ -222,15 +345,28 @@ class IOSSimulatorManager(EmulatorManager):
 
         Uses `xcrun simctl shutdown` for graceful termination.
         """
-        try:
-            self._log.info(
-                "Stopping iOS simulator",
-                action="simulator_stop",
-                udid=self.udid,
-            )
-        except Exception:
-            pass
-        run_cmd(["xcrun", "simctl", "shutdown", self.udid], check=False)
+        self._log.info(
+            "Stopping iOS simulator",
+            action="simulator_stop",
+            udid=self.udid,
+        )
+        run_cmd(["xcrun", "simctl", "shutdown", self.udid], check=False, capture_output=False)
+
+
+@functools.lru_cache(maxsize=1)
+def _list_simulators(ttl_bucket: int) -> dict[str, list[dict[str, Any]]]:
+    """
+    Return `simctl list --json` devices grouped by runtime.
+
+    Memoized per `ttl_bucket` (a _SIMCTL_LIST_TTL_S-second slot of the monotonic
+    clock), so repeated lookups skip the slow simctl call. The result is shared:
+    callers must not mutate it. Raises ValueError (not cached) if simctl fails.
+    """
+    out = run_cmd(["xcrun", "simctl", "list", "--json"], check=False)
+    if getattr(out, "returncode", 0) != 0:
+        raise ValueError("simctl list failed")
+    data = json.loads(getattr(out, "stdout", "") or "{}")  # JSONDecodeError is a ValueError
+    return cast(dict[str, list[dict[str, Any]]], data.get("devices") or {})
 
 
 def find_simulator_udid_by_name(
@@ -243,51 +379,28 @@ def find_simulator_udid_by_name(
     matching that version. Returns UDID of the first suitable simulator
     or None if not found.
     """
-    out = run_cmd(["xcrun", "simctl", "list", "--json"], check=False)
-    if getattr(out, "returncode", 0) != 0:
-        return None
-
     try:
-        data = json.loads(getattr(out, "stdout", "") or "{}")
-    except Exception:
+        devices = _list_simulators(int(time.monotonic()) // _SIMCTL_LIST_TTL_S)
+    except ValueError:
         return None
 
-    devices_raw = data.get("devices") or {}
-    devices = cast(dict[str, list[dict[str, Any]]], devices_raw)
+    # One pass over all runtimes: keep only devices with the requested name
+    named = [(rt, d) for rt, devs in devices.items() for d in devs if d.get("name") == device_name]
 
-    # Normalize version: 18.5 -> 18-5
-    normalized_ver = None
+    candidates = named
     if platform_version:
-        normalized_ver = str(platform_version).replace(".", "-")
-
-    candidates: list[dict[str, Any]] = []
-    for runtime, devs in devices.items():
-        if normalized_ver:
-            # Skip incompatible runtimes if we can parse them
-            # (key may be "iOS 18.5" or "com.apple.CoreSimulator.SimRuntime.iOS-18-5")
-            if ("iOS" not in runtime) or (
-                normalized_ver not in runtime and str(platform_version) not in runtime
-            ):
-                continue
-        for d in devs:
-            if d.get("name") == device_name:
-                candidates.append(d)
-
-    if not candidates:
-        # If nothing found with version filter, try without filtering by version
-        if normalized_ver:
-            for devs in devices.values():
-                for d in devs:
-                    if d.get("name") == device_name:
-                        candidates.append(d)
+        # Keep iOS runtimes of the requested version; the key may be "iOS 18.5" or
+        # "com.apple.CoreSimulator.SimRuntime.iOS-18-5" (version normalized 18.5 -> 18-5)
+        # If nothing matches the version, fall back to any runtime
+        pv = str(platform_version)
+        runtime_re = re.compile(
+            rf"iOS[^0-9]*(?:{re.escape(pv)}|{re.escape(pv.replace('.', '-'))})"
+        )
+        candidates = [(rt, d) for rt, d in named if runtime_re.search(rt)] or named
 
     if not candidates:
         return None
 
-    # Prefer already booted simulators
-    for d in candidates:
-        if d.get("state") == "Booted":
-            return d.get("udid")
-
-    # Otherwise, take the first available
-    return candidates[0].get("udid")
+    # Prefer already booted simulators, otherwise take the first available
+    _, best = min(candidates, key=lambda c: c[1].get("state") != "Booted")
+    return best.get("udid")
@@ -8,9 +8,10 @@ from appium.options.android import UiAutomator2Options
 
 from ..config.models import Settings
 from ..utils.logging import get_logger
+from .base import DriverFactory
 
 
-class AndroidDriverFactory:
+class AndroidDriverFactory(DriverFactory):
     """
     Factory class for creating and configuring Appium Android WebDriver instances.
     """
@@ -24,6 +25,43 @@ class AndroidDriverFactory:
         """
         self.settings = settings
         self._log = get_logger(__name__)
+        # Settings do not change between builds: resolve the URL and base caps once
+        self._executor = str(settings.appium.url).rstrip("/")
+        self._base_caps = self._build_base_caps()
+
+    def _build_base_caps(self) -> dict[str, Any]:
+        """Return the capabilities derived from settings (computed once per factory)."""
+        a = self.settings.android
+        caps: dict[str, Any] = {}
+        if a is None:
+            return caps
+
+        # --- Configure core Android capabilities ---
+        if a.app_path:
+            caps["app"] = a.app_path
+        if a.udid:
+            caps["udid"] = a.udid
+        if a.device_name:
+            caps["deviceName"] = a.device_name
+        if a.platform_version:
+            caps["platformVersion"] = a.platform_version
+
+        # --- Set Appium-specific options ---
+        caps["appium:automationName"] = "UIAutomator2"
+        caps["platformName"] = "Android"
+        caps["appium:noReset"] = a.no_reset
+        caps["appium:newCommandTimeout"] = a.new_command_timeout
+        caps["appium:dontStopAppOnReset"] = a.dont_stop_app_on_reset
+        caps["appium:unicodeKeyboard"] = a.unicode_keyboard
+        caps["appium:adbExecTimeout"] = a.adb_exec_timeout_ms
+        caps["appium:autoGrantPermissions"] = a.auto_grant_permissions
+        caps["appium:autoLaunch"] = a.auto_launch
+        if a.app_activity:
+            caps["appium:appActivity"] = a.app_activity
+        if a.app_package:
+            caps["appium:appPackage"] = a.app_package
+
+        return caps
 
     def build(self, capabilities: Mapping[str, Any]) -> webdriver.Remote:
         """
@@ -35,41 +73,11 @@ class AndroidDriverFactory:
         Returns:
             webdriver.Remote: Configured Appium driver ready for test execution.
         """
-        s = self.settings
-        opts = UiAutomator2Options()
-
-        # --- Configure core Android capabilities ---
-        if s.android and s.android.app_path:
-            opts.app = s.android.app_path
-        if s.android and s.android.udid:
-            opts.udid = s.android.udid
-        if s.android and s.android.device_name:
-            opts.device_name = s.android.device_name
-        if s.android and s.android.platform_version:
-            opts.platform_version = s.android.platform_version
-
-        # --- Set Appium-specific options ---
-        if s.android:
-            opts.set_capability("appium:automationName", "UIAutomator2")
-            opts.set_capability("platformName", "Android")
-            opts.set_capability("appium:noReset", s.android.no_reset)
-            opts.set_capability("appium:newCommandTimeout", s.android.new_command_timeout)
-            opts.set_capability("appium:dontStopAppOnReset", s.android.dont_stop_app_on_reset)
-            opts.set_capability("appium:unicodeKeyboard", s.android.unicode_keyboard)
-            opts.set_capability("appium:adbExecTimeout", s.android.adb_exec_timeout_ms)
-            opts.set_capability("appium:autoGrantPermissions", s.android.auto_grant_permissions)
-            opts.set_capability("appium:autoLaunch", s.android.auto_launch)
-            if s.android.app_activity:
-                opts.set_capability("appium:appActivity", s.android.app_activity)
-            if s.android.app_package:
-                opts.set_capability("appium:appPackage", s.android.app_package)
-
-        # --- Merge runtime-provided capabilities ---
-        for k, v in capabilities.items():
-            opts.set_capability(k, v)
+        # --- Merge runtime-provided capabilities (applied last, so they win) ---
+        opts = UiAutomator2Options().load_capabilities({**self._base_caps, **capabilities})
 
         # --- Create and return driver instance ---
-        executor = str(self.settings.appium.url).rstrip("/")
+        executor = self._executor
         self._log.info("Creating Android WebDriver", action="driver_start", executor=executor)
         drv = webdriver.Remote(command_executor=executor, options=opts)
         try:
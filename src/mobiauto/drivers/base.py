@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from collections.abc import Mapping
 from typing import Any
@@ -12,6 +13,8 @@ class DriverFactory(ABC):
     Abstract base class for driver factories.
 
     Defines an interface for creating and returning a configured Appium WebDriver instance.
+    `build_async` runs `build` in a worker thread, so async orchestrators can create
+    sessions for several devices concurrently.
     """
 
     @abstractmethod
@@ -26,3 +29,15 @@ class DriverFactory(ABC):
             WebDriver: Fully configured Appium WebDriver instance ready for test execution.
         """
         ...
+
+    async def build_async(self, capabilities: Mapping[str, Any]) -> WebDriver:
+        """
+        Run `build(capabilities)` in a worker thread.
+
+        Args:
+            capabilities (Mapping[str, Any]): Additional capabilities to apply.
+
+        Returns:
+            WebDriver: Fully configured Appium WebDriver instance ready for test execution.
+        """
+        return await asyncio.to_thread(self.build, capabilities)
@@ -8,9 +8,10 @@ from appium.options.ios import XCUITestOptions
 
 from ..config.models import Settings
 from ..utils.logging import get_logger
+from .base import DriverFactory
 
 
-class IOSDriverFactory:
+class IOSDriverFactory(DriverFactory):
     """
     Factory class for creating and configuring Appium iOS WebDriver instances.
     """
@@ -24,6 +25,45 @@ class IOSDriverFactory:
         """
         self.settings = settings
         self._log = get_logger(__name__)
+        # Settings do not change between builds: resolve the URL and base caps once
+        self._executor = str(settings.appium.url).rstrip("/")
+        self._base_caps = self._build_base_caps()
+
+    def _build_base_caps(self) -> dict[str, Any]:
+        """Return the capabilities derived from settings (computed once per factory)."""
+        i = self.settings.ios
+        caps: dict[str, Any] = {}
+        if i is None:
+            return caps
+
+        # --- Core iOS capabilities ---
+        if i.app_path:
+            caps["app"] = i.app_path
+        if i.bundle_id:
+            caps["appium:bundleId"] = i.bundle_id
+        if i.udid:
+            caps["udid"] = i.udid
+        if i.device_name:
+            caps["deviceName"] = i.device_name
+        if i.platform_version:
+            caps["platformVersion"] = i.platform_version
+
+        # --- Appium-specific settings ---
+        caps["appium:automationName"] = "XCUITest"
+        caps["platformName"] = "iOS"
+        caps["appium:connectHardwareKeyboard"] = i.connect_hardware_keyboard
+        caps["appium:autoAcceptAlerts"] = i.auto_accept_alerts
+        caps["appium:autoDismissAlerts"] = i.auto_dismiss_alerts
+        caps["showIOSLog"] = i.show_ios_log
+        caps["appium:autoLaunch"] = i.auto_launch
+
+        if i.process_arguments:
+            caps["processArguments"] = i.process_arguments
+
+        # Custom timeout for speeding up or slowing down XCTest snapshots
+        caps["settings[customSnapshotTimeout]"] = i.custom_snapshot_timeout
+
+        return caps
 
     def build(self, capabilities: Mapping[str, Any]) -> webdriver.Remote:
         """
@@ -35,43 +75,11 @@ class IOSDriverFactory:
         Returns:
             webdriver.Remote: Configured Appium WebDriver ready to run tests.
         """
-        s = self.settings
-        opts = XCUITestOptions()
-
-        # --- Core iOS capabilities ---
-        if s.ios and s.ios.app_path:
-            opts.app = s.ios.app_path
-        if s.ios and s.ios.bundle_id:
-            opts.set_capability("appium:bundleId", s.ios.bundle_id)
-        if s.ios and s.ios.udid:
-            opts.udid = s.ios.udid
-        if s.ios and s.ios.device_name:
-            opts.device_name = s.ios.device_name
-        if s.ios and s.ios.platform_version:
-            opts.platform_version = s.ios.platform_version
-
-        # --- Appium-specific settings ---
-        if s.ios:
-            opts.set_capability("appium:automationName", "XCUITest")
-            opts.set_capability("platformName", "iOS")
-            opts.set_capability("appium:connectHardwareKeyboard", s.ios.connect_hardware_keyboard)
-            opts.set_capability("appium:autoAcceptAlerts", s.ios.auto_accept_alerts)
-            opts.set_capability("appium:autoDismissAlerts", s.ios.auto_dismiss_alerts)
-            opts.set_capability("showIOSLog", s.ios.show_ios_log)
-            opts.set_capability("appium:autoLaunch", s.ios.auto_launch)
-
-            if s.ios.process_arguments:
-                opts.set_capability("processArguments", s.ios.process_arguments)
-
-            # Custom timeout for speeding up or slowing down XCTest snapshots
-            opts.set_capability("settings[customSnapshotTimeout]", s.ios.custom_snapshot_timeout)
-
-        # --- Merge runtime-provided capabilities ---
-        for k, v in capabilities.items():
-            opts.set_capability(k, v)
+        # --- Merge runtime-provided capabilities (applied last, so they win) ---
+        opts = XCUITestOptions().load_capabilities({**self._base_caps, **capabilities})
 
         # --- Create and return the driver instance ---
-        executor = str(self.settings.appium.url).rstrip("/")
+        executor = self._executor
         self._log.info("Creating iOS WebDriver", action="driver_start", executor=executor)
         drv = webdriver.Remote(command_executor=executor, options=opts)
         try:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import socket
 import threading
 from datetime import UTC, datetime
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
@@ -12,10 +13,17 @@ from .events import Event, EventData, EventStore
 
 logger = get_logger(__name__)
 
+# Largest request body read through the reusable per-connection buffer (bigger ones are
+# read into a one-off bytes object, so an occasional huge POST is not kept in memory)
+_BODY_BUF_MAX = 1024 * 1024
+
 
 class _EventStoreHTTPServer(ThreadingHTTPServer):
     """ThreadingHTTPServer with a typed event_store attribute."""
 
+    # Deeper accept backlog so event bursts are queued rather than refused
+    request_queue_size = 128
+
     def __init__(
         self,
         server_address: tuple[str, int],
@@ -24,6 +32,35 @@ class _EventStoreHTTPServer(ThreadingHTTPServer):
     ) -> None:  # noqa: N803 (arg name from base)
         super().__init__(server_address, RequestHandlerClass)
         self.event_store: EventStore = event_store
+        # Client connections being served, so stop() can close idle keep-alive ones
+        self._connections: set[socket.socket] = set()
+        self._connections_lock = threading.Lock()
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        with self._connections_lock:
+            self._connections.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request: Any) -> None:
+        with self._connections_lock:
+            self._connections.discard(request)
+        super().shutdown_request(request)
+
+    def close_connections(self) -> None:
+        """
+        Shut down every open client connection.
+
+        Handler threads blocked reading the next keep-alive request see EOF and exit,
+        instead of serving later requests into this server's EventStore.
+        """
+        with self._connections_lock:
+            connections = list(self._connections)
+        for conn in connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                # Already closed by its handler
+                pass
 
 
 class _BatchHandler(BaseHTTPRequestHandler):
@@ -31,8 +68,24 @@ class _BatchHandler(BaseHTTPRequestHandler):
     Simple HTTP handler for receiving batched events on the "/event" endpoint.
 
     EventStore is passed via self.server.event_store.
+
+    Speaks HTTP/1.1 with keep-alive, so a client posting many batches reuses one
+    connection (and one server thread) instead of opening a new one per request.
     """
 
+    protocol_version = "HTTP/1.1"
+    # Socket timeout (seconds): an idle keep-alive connection is dropped rather than
+    # holding its handler thread forever
+    timeout = 5
+    # Buffer writes: status line, headers and body leave in one send when the base class
+    # flushes after each request, instead of one send for the headers and one for the body
+    wbufsize = -1
+
+    def setup(self) -> None:
+        super().setup()
+        # Body buffer reused by every request on this (keep-alive) connection
+        self._body_buf = bytearray()
+
     # Disable verbose http.server logging; use our structured logger instead
     def log_message(
         self, fmt: str, *args: Any
@@ -47,36 +100,36 @@ class _BatchHandler(BaseHTTPRequestHandler):
             parsed = urlsplit(self.path)
             path = parsed.path
             if path != "/event":
+                # The body is left unread, so the connection cannot be reused
+                self.close_connection = True
                 self._send_text(404, "Not Found")
                 return
 
-            length_str = self.headers.get("Content-Length") or "0"
             try:
-                length = int(length_str)
+                length = int(self.headers.get("Content-Length") or 0)
             except ValueError:
-                length = 0
-            if "Content-Length" in self.headers:
-                length = int(self.headers["Content-Length"])
-                body_bytes = self.rfile.read(length)
+                length = -1
+            if length < 0:
+                # The body size is unknown, so the connection cannot be reused
+                self.close_connection = True
+                self._send_text(400, "Bad Request")
+                return
+            if length or "chunked" not in self.headers.get("Transfer-Encoding", "").lower():
+                # No Content-Length and no chunked encoding means an empty body (HTTP/1.1)
+                body_text = self._read_body(length)
             else:
-                # Safe fallback with timeout
+                # Chunked body: read what arrives (with a timeout); the body ends at EOF,
+                # so the connection cannot be reused afterwards
+                self.close_connection = True
                 self.connection.settimeout(1.0)
-                body_bytes = self.rfile.read(1024 * 1024)
-            body_text = body_bytes.decode("utf-8", errors="replace")
+                body_text = self.rfile.read(1024 * 1024).decode("utf-8", errors="replace")
 
             store: EventStore = cast(_EventStoreHTTPServer, self.server).event_store
-            last = store.get_last_event()
-            next_num = (last.event_num if last else 0) + 1
 
-            # Headers as dict: name -> [values]
+            # Headers as dict: name -> [values], in one pass (repeated headers are grouped)
             headers_dict: dict[str, list[str]] = {}
-            try:
-                for k in self.headers.keys():
-                    vals = self.headers.get_all(k) or []
-                    headers_dict[str(k)] = [str(v) for v in vals]
-            except Exception:
-                # Fallback if get_all is not available for some reason
-                headers_dict = {k: [v] for k, v in self.headers.items()}
+            for k, v in self.headers.items():
+                headers_dict.setdefault(k, []).append(v)
 
             data = EventData(
                 uri=path,
@@ -86,24 +139,40 @@ class _BatchHandler(BaseHTTPRequestHandler):
                 body=body_text,
             )
 
-            event = Event(
-                event_time=datetime.now(UTC).isoformat(),
-                event_num=next_num,
-                name="BATCH",
-                data=data,
+            event_time = datetime.now(UTC).isoformat()
+            # Numbered and stored in one locked step: concurrent POSTs get distinct numbers
+            store.add_next_event(
+                lambda num: Event(event_time=event_time, event_num=num, name="BATCH", data=data)
             )
-
-            store.add_events([event])
             logger.info("batch_saved", count=1)
 
             self._send_text(200, "OK")
         except Exception as e:  # Handler must never crash
             logger.exception("batch_handler_error", error=str(e))
+            self.close_connection = True
             try:
                 self._send_text(500, "Internal Server Error")
             except Exception:
                 pass
 
+    def _read_body(self, length: int) -> str:
+        """
+        Read a `length`-byte body and decode it as UTF-8.
+
+        Reads into the connection's reusable buffer and decodes straight from it, so
+        no intermediate bytes object is allocated per request.
+        """
+        if length > _BODY_BUF_MAX:
+            return self.rfile.read(length).decode("utf-8", errors="replace")
+        if len(self._body_buf) < length:
+            self._body_buf = bytearray(length)
+        view = memoryview(self._body_buf)[:length]
+        try:
+            n = self.rfile.readinto(view)
+            return str(view[:n], "utf-8", "replace")
+        finally:
+            view.release()
+
     def do_GET(self) -> None:  # noqa: N802 - method name defined by base class
         # Simple healthcheck
         parsed = urlsplit(self.path)
@@ -117,6 +186,11 @@ class _BatchHandler(BaseHTTPRequestHandler):
         self.send_response(code)
         self.send_header("Content-Type", "text/plain; charset=utf-8")
         self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        elif self.request_version == "HTTP/1.0":
+            # HTTP/1.0 clients that asked for keep-alive only reuse the socket if confirmed
+            self.send_header("Connection", "keep-alive")
         self.end_headers()
         self.wfile.write(data)
 
@@ -146,6 +220,8 @@ class BatchHttpServer:
         try:
             self._server.shutdown()
             self._server.server_close()
+            # Keep-alive connections outlive the listening socket: close them too
+            self._server.close_connections()
         finally:
             if self._thread:
                 self._thread.join(timeout=5)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import functools
 import json
 import re
 import threading
 import time
 from collections.abc import Callable, Iterable
 from dataclasses import dataclass
+from datetime import datetime
 from difflib import unified_diff
 from types import TracebackType
 from typing import Any, Literal, Protocol, assert_never
@@ -27,15 +29,30 @@ from ..reporting.manager import (  # noqa: F401  # reserved for future (artifact
 from ..utils.logging import get_logger
 from .events import Event, EventData, EventStore
 
+try:
+    # Optional (extra "fast-json"): several times faster decoding in the matching hot paths
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 logger = get_logger(__name__)
 
 
 # ---------- JSON matching utilities (JsonMatchers-style) ----------
 
+# JSON scalar types. Decoded JSON holds exactly these types, so `type(x) in _JSON_SCALARS`
+# settles most checks; _is_scalar falls back to isinstance for subclasses (e.g. StrEnum)
+_JSON_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+
+def _is_scalar(value: Any) -> bool:
+    """Return whether `value` is a JSON primitive (None, or str/int/float/bool or a subclass)."""
+    return type(value) in _JSON_SCALARS or isinstance(value, str | int | float)
+
 
 def match_json_element(event_element: Any, search_element: Any) -> bool:
     """
-    Recursively match two JSON-like structures with flexible rules.
+    Match two JSON-like structures with flexible rules.
 
     Supported:
 
@@ -50,72 +67,88 @@ def match_json_element(event_element: Any, search_element: Any) -> bool:
     - Strings containing serialized JSON:
       - we try to parse and match recursively
     """
-    # Primitive vs primitive
-    if isinstance(event_element, str | int | float | bool) or event_element is None:
-        if isinstance(search_element, str | int | float | bool) or search_element is None:
-            if isinstance(search_element, str):
-                if search_element == "*":
-                    return True
-                if search_element == "":
-                    return isinstance(event_element, str) and event_element == ""
-                if search_element.startswith("~"):
-                    needle = search_element[1:]
-                    return isinstance(event_element, str) and needle in event_element
-                # Exact match (stringified)
+    # Pairs that must all match. Nested objects (and JSON strings) are pushed rather
+    # than recursed into; only array items, where any candidate may match, recurse.
+    stack = [(event_element, search_element)]
+    while stack:
+        actual, expected = stack.pop()
+
+        if _is_scalar(actual):
+            # Primitive vs primitive
+            if _is_scalar(expected):
+                if not _match_scalar(actual, expected):
+                    return False
+                continue
+            # Actual is primitive string that might contain JSON - try to parse it
+            if isinstance(actual, str):
                 try:
-                    return str(event_element) == search_element
+                    parsed = _json_loads(actual)
                 except Exception:
                     return False
-            # Non-string expected -> direct equality
-            return event_element == search_element
+                stack.append((parsed, expected))
+                continue
+            return False
 
-        # Actual is primitive string that might contain JSON - try to parse it
-        if isinstance(event_element, str):
-            try:
-                parsed = json.loads(event_element)
-            except Exception:
-                return False
-            return match_json_element(parsed, search_element)
-        return False
+        # Object vs object
+        if isinstance(actual, dict) and isinstance(expected, dict):
+            for k, sv in expected.items():
+                if k not in actual:
+                    return False
+                stack.append((actual[k], sv))
+            continue
 
-    # Object vs object
-    if isinstance(event_element, dict) and isinstance(search_element, dict):
-        for k, sv in search_element.items():
-            if k not in event_element:
-                return False
-            if not match_json_element(event_element[k], sv):
-                return False
-        return True
+        # Array vs array: every expected item must be found in the actual array
+        if isinstance(actual, list) and isinstance(expected, list):
+            for se in expected:
+                if not any(match_json_element(ee, se) for ee in actual):
+                    return False
+            continue
+
+        return False
+    return True
 
-    # Array vs array: every expected item must be found in the actual array
-    if isinstance(event_element, list) and isinstance(search_element, list):
-        for se in search_element:
-            if not any(match_json_element(ee, se) for ee in event_element):
-                return False
-        return True
 
-    # Actual is a string - maybe it is JSON
-    if isinstance(event_element, str):
+def _match_scalar(actual: Any, expected: Any) -> bool:
+    """Match two JSON scalars, applying the "*", "" and "~value" patterns of `expected`."""
+    if isinstance(expected, str):
+        if expected == "*":
+            return True
+        if expected == "":
+            return isinstance(actual, str) and actual == ""
+        if expected.startswith("~"):
+            return isinstance(actual, str) and expected[1:] in actual
+        # Exact match (stringified)
         try:
-            parsed = json.loads(event_element)
+            return str(actual) == expected
         except Exception:
             return False
-        return match_json_element(parsed, search_element)
-
-    return False
+    # Non-string expected -> direct equality
+    return bool(actual == expected)
 
 
 def find_key_value_in_tree(element: Any, key: str, search_value: Any) -> bool:
     """Depth-first search in a JSON tree for key with value matched by match_json_element."""
-    if isinstance(element, dict):
-        for k, v in element.items():
-            if (k == key and match_json_element(v, search_value)) or find_key_value_in_tree(
-                v, key, search_value
-            ):
-                return True
-        return False
-    if isinstance(element, list):
-        return any(find_key_value_in_tree(it, key, search_value) for it in element)
+    return _find_key_value(element, key, search_value)
+
+
+def _find_key_value(element: Any, key: str, search_value: Any, skip: Any = None) -> bool:
+    """find_key_value_in_tree, not descending into the `skip` subtree (by identity)."""
+    # Explicit stack of containers still to visit (no recursion on deep documents)
+    stack = [element]
+    while stack:
+        node = stack.pop()
+        if node is skip:
+            continue
+        if isinstance(node, dict):
+            for k, v in node.items():
+                if k == key and match_json_element(v, search_value):
+                    return True
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            continue
+        stack.extend(c for c in reversed(children) if isinstance(c, dict | list))
     return False
 
 
@@ -134,14 +167,55 @@ def contains_json_data(event_json: str, search_json: str) -> bool:
         perform deep search across the entire body object.
         If there is a dedicated `data` node, we try it first for efficiency.
     """
+    search_items = _search_items(search_json)
+    if search_items is None:
+        return False
     try:
-        ev_obj = json.loads(event_json)
-        body_str = ev_obj["body"]
-        body_obj = json.loads(body_str)
-        search_obj = json.loads(search_json)
+        ev_obj = _json_loads(event_json)
+        body_obj = _json_loads(ev_obj["body"])
     except Exception:
         return False
+    return _body_contains(body_obj, search_items)
+
 
+def _search_items(search_json: str) -> list[tuple[str, Any]] | None:
+    """
+    Parse an expected-subset JSON string into its (key, value) pairs.
+
+    Returns None if it is not valid JSON (nothing matches), and no pairs if it is not
+    an object (everything matches), as contains_json_data always did. Parse once per
+    check, not once per scanned event.
+    """
+    try:
+        search_obj = _json_loads(search_json)
+    except Exception:
+        return None
+    return list(search_obj.items()) if isinstance(search_obj, dict) else []
+
+
+def _event_body_contains(ev: Event, search_items: list[tuple[str, Any]]) -> bool:
+    """contains_json_data for a stored event, reading its body without re-serializing it."""
+    if ev.data is None:
+        return False
+    try:
+        body_obj = _json_loads(ev.data.body)
+    except Exception:
+        return False
+    return _body_contains(body_obj, search_items)
+
+
+def _event_data_json(ev: Event | None) -> str | None:
+    """Serialize an event's EventData (by alias) for Allure artifacts; None if unavailable."""
+    if ev is None or ev.data is None:
+        return None
+    try:
+        return ev.data.model_dump_json(by_alias=True)
+    except Exception:
+        return None
+
+
+def _body_contains(body_obj: Any, search_items: list[tuple[str, Any]]) -> bool:
+    """Deep-search a parsed event body for every expected (key, value) pair."""
     data_el = None
     if isinstance(body_obj, dict):
         if isinstance(body_obj.get("event"), dict) and "data" in body_obj["event"]:
@@ -149,13 +223,14 @@ def contains_json_data(event_json: str, search_json: str) -> bool:
         elif "data" in body_obj:
             data_el = body_obj["data"]
 
-    items = search_obj.items() if isinstance(search_obj, dict) else []
-    for key, val in items:
-        found = False
-        if data_el is not None:
-            found = find_key_value_in_tree(data_el, key, val)
-        if not found:
-            found = find_key_value_in_tree(body_obj, key, val)
+    for key, val in search_items:
+        if data_el is None:
+            found = _find_key_value(body_obj, key, val)
+        else:
+            # The data node is tried first; the body fallback need not walk it again
+            found = _find_key_value(data_el, key, val) or _find_key_value(
+                body_obj, key, val, skip=data_el
+            )
         if not found:
             return False
     return True
@@ -275,7 +350,7 @@ class JsonEventIngestor:
         events: list[Event] = []
         for raw in payloads:
             try:
-                data = json.loads(raw) if isinstance(raw, str) else raw
+                data = _json_loads(raw) if isinstance(raw, str) else raw
 
                 # Envelope { meta, events: [...] }
                 if isinstance(data, dict) and isinstance(data.get("events"), list):
@@ -353,13 +428,36 @@ def _name_matches(actual: str, expected: str, mode: MatchMode) -> bool:
     if mode == "starts_with":
         return actual.startswith(expected)
     if mode == "regex":
-        try:
-            return re.search(expected, actual) is not None
-        except re.error:
-            return False
+        pattern = _compile_name_pattern(expected)
+        return pattern is not None and pattern.search(actual) is not None
     assert_never(mode)
 
 
+@functools.lru_cache(maxsize=256)
+def _compile_name_pattern(expected: str) -> re.Pattern[str] | None:
+    """Compile a name pattern once per distinct pattern; None if it is not a valid regex."""
+    try:
+        return re.compile(expected)
+    except re.error:
+        return None
+
+
+def _event_timestamp(event_time: str) -> float | None:
+    """
+    Return `event_time` as epoch seconds, or None if it cannot be parsed.
+
+    Accepts numeric timestamps and ISO 8601 strings (as stored by BatchHttpServer).
+    """
+    try:
+        return float(event_time)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(event_time).timestamp()
+    except ValueError:
+        return None
+
+
 class EventVerifier:
     """
     EventVerifier: wait for events (sync/async), filter them, and attach diagnostics to Allure.
@@ -392,35 +490,26 @@ class EventVerifier:
     ) -> list[Event]:
         """Return events matching the given filter criteria."""
         events = self.store.get_events()
+        search_items = _search_items(json_contains) if json_contains is not None else None
         res: list[Event] = []
         for e in events:
             if name is not None and not _name_matches(e.name, name, name_mode):
                 continue
-            if since is not None:
-                try:
-                    t = float(e.event_time)
-                except Exception:
-                    t = None
-                if t is None or t < since:
+            if since is not None or until is not None:
+                # Parsed once per event for both bounds
+                t = _event_timestamp(e.event_time)
+                if t is None:
                     continue
-            if until is not None:
-                try:
-                    t_until = float(e.event_time)
-                except Exception:
-                    t_until = None
-                if t_until is None or t_until > until:
+                if since is not None and t < since:
+                    continue
+                if until is not None and t > until:
                     continue
             if where and not where(e):
                 continue
-            if json_contains is not None:
-                try:
-                    event_data_json = (
-                        e.data.model_dump_json(by_alias=True) if e.data is not None else None
-                    )
-                except Exception:
-                    event_data_json = None
-                if not event_data_json or not contains_json_data(event_data_json, json_contains):
-                    continue
+            if json_contains is not None and (
+                search_items is None or not _event_body_contains(e, search_items)
+            ):
+                continue
             res.append(e)
         return res
 
@@ -450,7 +539,7 @@ class EventVerifier:
 
         def _pretty_load(s: str) -> str:
             try:
-                return json.dumps(json.loads(s), ensure_ascii=False, indent=2)
+                return json.dumps(_json_loads(s), ensure_ascii=False, indent=2)
             except Exception:
                 return s
 
@@ -468,14 +557,14 @@ class EventVerifier:
             For Allure: expand `body` into an object when possible.
             """
             try:
-                obj = json.loads(actual_json)
+                obj = _json_loads(actual_json)
             except Exception:
                 return actual_json
 
             body = obj.get("body")
             if isinstance(body, str):
                 try:
-                    parsed_body = json.loads(body)
+                    parsed_body = _json_loads(body)
                 except Exception:
                     parsed_body = None
                 if parsed_body is not None:
@@ -598,6 +687,8 @@ class EventVerifier:
             expected_json_str = json.dumps(event_data, ensure_ascii=False)
         elif isinstance(event_data, str):
             expected_json_str = event_data
+        # Parsed once here instead of once per scanned event
+        search_items = _search_items(expected_json_str) if expected_json_str is not None else None
 
         logger.info("wait_for_event_start", timeout=timeout_sec)
 
@@ -606,16 +697,9 @@ class EventVerifier:
         # Fast path: scan existing history
         with allure.step(f"Wait for event '{event_data}' (timeout={timeout_sec}s) [history]"):
             for ev in existing_events:
-                if self.store.is_event_already_matched(ev.event_num) and consume:
+                if consume and self.store.is_event_already_matched(ev.event_num):
                     continue
 
-                try:
-                    event_data_json = (
-                        ev.data.model_dump_json(by_alias=True) if ev.data is not None else None
-                    )
-                except Exception:
-                    event_data_json = None
-
                 # Match any event
                 if expected_json_str is None:
                     if consume:
@@ -627,13 +711,13 @@ class EventVerifier:
                     )
                     self._attach_json_artifacts(
                         expected=None,
-                        actual=event_data_json,
+                        actual=_event_data_json(ev),
                         name_prefix="event_check(history)",
                     )
                     return True
 
                 # Match by subset in body
-                if event_data_json and contains_json_data(event_data_json, expected_json_str):
+                if search_items is not None and _event_body_contains(ev, search_items):
                     if consume:
                         self.store.mark_event_as_matched(ev.event_num)
                     logger.info(
@@ -643,7 +727,7 @@ class EventVerifier:
                     )
                     self._attach_json_artifacts(
                         expected=expected_json_str,
-                        actual=event_data_json,
+                        actual=_event_data_json(ev),
                         name_prefix="event_check(history)",
                     )
                     return True
@@ -653,20 +737,17 @@ class EventVerifier:
         deadline = time.time() + timeout_sec
 
         with allure.step(f"Wait for event '{event_data}' (timeout={timeout_sec}s) [polling]"):
-            last_event_json: str | None = None
-            while time.time() < deadline:
-                new_events = self.store.get_index_events(start_index)
+            last_event: Event | None = None  # Serialized only if the wait times out
+            # Bound once for the polling loop
+            now = time.time
+            get_new_events = self.store.get_index_events
+            is_matched = self.store.is_event_already_matched
+            while now() < deadline:
+                new_events = get_new_events(start_index)
                 for ev in new_events:
-                    if self.store.is_event_already_matched(ev.event_num) and consume:
+                    if consume and is_matched(ev.event_num):
                         continue
 
-                    try:
-                        event_data_json = (
-                            ev.data.model_dump_json(by_alias=True) if ev.data is not None else None
-                        )
-                    except Exception:
-                        event_data_json = None
-
                     if expected_json_str is None:
                         if consume:
                             self.store.mark_event_as_matched(ev.event_num)
@@ -677,12 +758,12 @@ class EventVerifier:
                         )
                         self._attach_json_artifacts(
                             expected=None,
-                            actual=event_data_json,
+                            actual=_event_data_json(ev),
                             name_prefix="event_check(poll)",
                         )
                         return True
 
-                    if event_data_json and contains_json_data(event_data_json, expected_json_str):
+                    if search_items is not None and _event_body_contains(ev, search_items):
                         if consume:
                             self.store.mark_event_as_matched(ev.event_num)
                         logger.info(
@@ -692,12 +773,13 @@ class EventVerifier:
                         )
                         self._attach_json_artifacts(
                             expected=expected_json_str,
-                            actual=event_data_json,
+                            actual=_event_data_json(ev),
                             name_prefix="event_check(poll)",
                         )
                         return True
 
-                    last_event_json = event_data_json or last_event_json
+                    if ev.data is not None:
+                        last_event = ev
 
                 start_index += len(new_events)
                 time.sleep(polling_interval)
@@ -709,7 +791,7 @@ class EventVerifier:
             logger.warning("wait_for_event_timeout")
             self._attach_json_artifacts(
                 expected=expected_json_str,
-                actual=last_event_json,
+                actual=_event_data_json(last_event),
                 name_prefix="event_check",
             )
             if soft:
@@ -789,7 +871,7 @@ class EventVerifier:
         else:
             expected_json_str = event_data
             try:
-                parsed = json.loads(expected_json_str)
+                parsed = _json_loads(expected_json_str)
             except Exception as err:
                 raise ValueError("event_data must be a JSON object with key/value pairs") from err
             if not isinstance(parsed, dict):
@@ -815,16 +897,12 @@ class EventVerifier:
                         )
 
                 # Collect events matching JSON filter
-                matched_events: list[Event] = []
-                for ev in self.store.get_events():
-                    try:
-                        ev_json = (
-                            ev.data.model_dump_json(by_alias=True) if ev.data is not None else None
-                        )
-                    except Exception:
-                        ev_json = None
-                    if ev_json and contains_json_data(ev_json, expected_json_str):
-                        matched_events.append(ev)
+                search_items = _search_items(expected_json_str)
+                matched_events = [
+                    ev
+                    for ev in self.store.get_events()
+                    if search_items is not None and _event_body_contains(ev, search_items)
+                ]
 
                 if not matched_events:
                     if attempt < max_attempts - 1:
@@ -866,7 +944,7 @@ class EventVerifier:
                 if matched_event.data is None:
                     raise LookupError("Matched event is missing 'data' field")
 
-                body_obj = json.loads(matched_event.data.body)
+                body_obj = _json_loads(matched_event.data.body)
 
                 def _iter_candidate_items(root: Any) -> Iterable[dict[str, Any]]:
                     # Yield all dict items under typical paths: event.data.items, data.items, events[*].data.items
@@ -899,7 +977,7 @@ class EventVerifier:
                         for el in root:
                             yield from _iter_candidate_items(el)
 
-                search_obj = json.loads(expected_json_str)
+                search_obj = _json_loads(expected_json_str)
                 if not isinstance(search_obj, dict):
                     raise ValueError("event_data must be a JSON object with key/value pairs")
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import threading
+from collections.abc import Callable
 
 from pydantic import AliasChoices, BaseModel, Field
 
@@ -61,6 +62,7 @@ class EventStore:
 
     def __init__(self) -> None:
         self._events: list[Event] = []
+        self._event_nums: set[int] = set()  # event_num of every stored event (duplicate check)
         self._matched_events: set[int] = set()
         self._lock = threading.RLock()
 
@@ -72,6 +74,7 @@ class EventStore:
             for event in new_events:
                 if not self._event_exists(event.event_num):
                     self._events.append(event)
+                    self._event_nums.add(event.event_num)
 
                     payload = None
                     if event.data:
@@ -102,8 +105,21 @@ class EventStore:
                         name=event.name,
                     )
 
+    def add_next_event(self, make: Callable[[int], Event]) -> Event:
+        """
+        Build an event numbered after the last stored one and add it, atomically.
+
+        `make` receives the next event_num (last + 1, or 1 for an empty store). Numbering
+        and insertion happen under one lock, so concurrent producers never claim the
+        same number (add_events would drop the second one as a duplicate).
+        """
+        with self._lock:
+            event = make((self._events[-1].event_num if self._events else 0) + 1)
+            self.add_events([event])
+        return event
+
     def _event_exists(self, event_number: int) -> bool:
-        return any(e.event_num == event_number for e in self._events)
+        return event_number in self._event_nums
 
     def mark_event_as_matched(self, event_num: int) -> None:
         with self._lock:
@@ -147,5 +163,6 @@ class EventStore:
     def clear(self) -> None:
         with self._lock:
             self._events.clear()
+            self._event_nums.clear()
             self._matched_events.clear()
         logger.info("events_cleared")
@@ -18,6 +18,7 @@ from ..device.appium_server_manager import manager as appium_manager
 from ..device.base import EmulatorManager
 from ..device.ios_simulator import IOSSimulatorManager, find_simulator_udid_by_name
 from ..drivers.android import AndroidDriverFactory
+from ..drivers.base import DriverFactory
 from ..drivers.ios import IOSDriverFactory
 from ..network.event_server import BatchHttpServer
 from ..network.event_verifier import EventVerifier
@@ -392,9 +393,21 @@ def report_manager(settings: Settings) -> ReportManager:
     return rm
 
 
+@pytest.fixture(scope="session")
+def driver_factory(settings: Settings) -> DriverFactory:
+    """
+    Create the driver factory for the configured platform once per session,
+    so every test reuses its resolved executor URL and base capabilities.
+    """
+    if settings.platform == "android":
+        return AndroidDriverFactory(settings)
+    return IOSDriverFactory(settings)
+
+
 @pytest.fixture(scope="function")
 def driver(
     settings: Settings,
+    driver_factory: DriverFactory,
     appium_server: None,
     request: pytest.FixtureRequest,
     mitm_proxy: dict[str, object] | None,
@@ -434,10 +447,7 @@ def driver(
             )
 
     with allure.step(f"Create WebDriver: {settings.platform}"):
-        if settings.platform == "android":
-            drv: WebDriver = AndroidDriverFactory(settings).build(caps)
-        else:
-            drv = IOSDriverFactory(settings).build(caps)
+        drv = driver_factory.build(caps)
 
     try:
         bind_context(settings=settings, driver=drv, test_name=request.node.name)
@@ -4,16 +4,23 @@ import os
 from typing import Any
 
 import allure
+import urllib3
+from selenium.common.exceptions import WebDriverException
 
+from mobiauto.device.appium_server_manager import manager as appium_manager
 from mobiauto.utils.logging import current_test_log_path
 
+# Errors that may mean the Appium server went away (urllib3 errors: connection refused/reset)
+_DRIVER_ERRORS = (WebDriverException, urllib3.exceptions.HTTPError, ConnectionError)
+
 
 def pytest_runtest_makereport(item: Any, call: Any) -> None:
     """
     Pytest hook: called after each test phase (setup, call, teardown).
 
     When the main test phase (call) fails, attaches the tail of the current test logs
-    to the Allure report to speed up debugging.
+    to the Allure report to speed up debugging. Driver/connection errors also prompt
+    the Appium monitor to check the server right away.
     """
     try:
         # We are only interested in the actual test function phase
@@ -23,6 +30,10 @@ def pytest_runtest_makereport(item: Any, call: Any) -> None:
         if not failed:
             return
 
+        # Let the Appium monitor check the server now rather than at its next poll
+        if call.excinfo.errisinstance(_DRIVER_ERRORS):
+            appium_manager.report_failure()
+
         # Resolve log file path for the current test
         path = current_test_log_path(getattr(item, "name", None))
         content = ""
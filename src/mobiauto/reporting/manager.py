@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Any, ClassVar, Literal
 
 import allure
+import allure_commons
 
 from ..config.loader import load_settings
 from ..config.models import ReportingSettings
@@ -57,6 +58,14 @@ class ReportManager:
         """Set the global ReportManager instance (used by fixtures)."""
         cls._default = manager
 
+    @staticmethod
+    def is_allure_collecting() -> bool:
+        """Return True if an Allure listener is registered to record steps."""
+        try:
+            return bool(allure_commons.plugin_manager.hook.start_step.get_hookimpls())
+        except Exception:
+            return True
+
     # ----- Low-level safe methods -----
     @staticmethod
     def _safe_attach_screenshot(driver: Any, *, name: str) -> None:
@@ -2,31 +2,25 @@ from __future__ import annotations
 
 import subprocess
 from collections.abc import Sequence
+from typing import IO, Any
 
 
 class Completed:
     """
-    Wrapper around subprocess.CompletedProcess that decodes stdout and stderr into strings.
+    Wrapper around subprocess.CompletedProcess with stdout and stderr as strings.
     """
 
-    def __init__(self, proc: subprocess.CompletedProcess):
+    def __init__(self, proc: subprocess.CompletedProcess[str]):
         """
         Initialize a Completed object based on subprocess.CompletedProcess.
 
         Args:
-            proc (subprocess.CompletedProcess): The completed process instance.
+            proc (subprocess.CompletedProcess[str]): The completed process instance,
+                run in text mode.
         """
         self.returncode = proc.returncode
-        self.stdout = (
-            proc.stdout.decode()
-            if isinstance(proc.stdout, bytes | bytearray)
-            else (proc.stdout or "")
-        )
-        self.stderr = (
-            proc.stderr.decode()
-            if isinstance(proc.stderr, bytes | bytearray)
-            else (proc.stderr or "")
-        )
+        self.stdout = proc.stdout or ""
+        self.stderr = proc.stderr or ""
 
 
 def run_cmd(
@@ -35,6 +29,9 @@ def run_cmd(
     check: bool = True,
     spawn: bool = False,
     timeout: int | None = None,
+    stdout: int | IO[Any] | None = None,
+    stderr: int | IO[Any] | None = None,
+    capture_output: bool = True,
 ) -> Completed | subprocess.Popen:
     """
     Execute a command as a subprocess.
@@ -44,6 +41,13 @@ def run_cmd(
         check (bool): If True, raise CalledProcessError on failure.
         spawn (bool): If True, start the process asynchronously and return a Popen object.
         timeout (int | None): Optional timeout in seconds for waiting for completion.
+        stdout (int | IO | None): Where a spawned process writes stdout (subprocess.PIPE
+            or an open file). Inherited from the parent by default; ignored unless
+            `spawn=True`.
+        stderr (int | IO | None): Same as `stdout`, for stderr (e.g. subprocess.STDOUT).
+        capture_output (bool): If False, discard the output of a non-spawned process
+            (stdout/stderr of the result are empty); for callers that only need the
+            exit code.
 
     Returns:
         Completed | subprocess.Popen:
@@ -54,9 +58,21 @@ def run_cmd(
         subprocess.CalledProcessError: If `check=True` and process exits with a nonzero code.
     """
     if spawn:
-        return subprocess.Popen(args)
+        return subprocess.Popen(args, stdout=stdout, stderr=stderr)
 
-    proc = subprocess.run(args, capture_output=True, timeout=timeout, check=False)
+    # Decode once in text mode so callers always get str output
+    sink: dict[str, int] = (
+        {} if capture_output else {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    )
+    proc = subprocess.run(
+        args,
+        capture_output=capture_output,
+        text=True,
+        encoding="utf-8",
+        timeout=timeout,
+        check=False,
+        **sink,
+    )
 
     if check and proc.returncode != 0:
         raise subprocess.CalledProcessError(proc.returncode, args, proc.stdout, proc.stderr)
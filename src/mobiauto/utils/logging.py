@@ -135,6 +135,8 @@ def bind_context(
 
 
 _CONFIGURED = False
+# Filtering level applied by setup_logging (None until configured)
+_LEVEL: int | None = None
 
 
 def setup_logging() -> None:
@@ -152,13 +154,14 @@ def setup_logging() -> None:
     """
     import logging
 
-    global _CONFIGURED
+    global _CONFIGURED, _LEVEL
     if _CONFIGURED:
         return
 
     _ensure_log_dir()
 
     level = _level_from_env()
+    _LEVEL = level
 
     structlog.configure(
         processors=[
@@ -199,8 +202,19 @@ def get_logger(name: str | None = None) -> Any:
     return structlog.get_logger(name or __name__)
 
 
+def is_enabled_for(level: int) -> bool:
+    """
+    Return True if records of the given level pass the configured filtering level.
+
+    Lets hot paths skip building keyword arguments for records that would be dropped.
+    """
+    configured = _LEVEL
+    return level >= (configured if configured is not None else _level_from_env())
+
+
 __all__ = [
     "setup_logging",
+    "is_enabled_for",
     "bind_context",
     "current_test_log_path",
     "get_logger",
@@ -676,6 +676,38 @@ class TestMobileController:
             and drv.exec_calls[-1][1]["percent"] == 0.01
         )
 
+    def test_perform_scroll_reads_window_size_once_per_call(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        drv = self.DummyDrv({"platformName": "Android"})
+        report = self.FakeReport()
+        ctl = MobileController(cast(Any, drv), report_manager=cast(Any, report))
+        monkeypatch.setattr("mobiauto.core.controller.allure.step", self.StepSpy())
+        sizes: list[int] = []
+        orig = drv.get_window_size
+
+        def counting_size() -> dict[str, int]:
+            sizes.append(1)
+            return orig()
+
+        monkeypatch.setattr(drv, "get_window_size", counting_size)
+
+        ctl.perform_scroll(count=2, capacity=0.5)
+        assert len(sizes) == 1
+        # A new call re-reads the size (e.g. after a rotation)
+        ctl.perform_scroll(count=1, capacity=0.5)
+        assert len(sizes) == 2
+
+        assert [name for name, _ in drv.exec_calls] == ["mobile: scrollGesture"] * 3
+        assert drv.exec_calls[0][1] == {
+            "left": 10,
+            "top": 20,
+            "width": 700,
+            "height": 1400,
+            "direction": "down",
+            "percent": 0.5,
+        }
+
     # -----------------------
     # System/native actions
     # -----------------------
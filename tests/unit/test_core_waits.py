@@ -5,10 +5,29 @@ from types import MethodType
 from typing import cast
 
 import pytest
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    WebDriverException,
+)
 from selenium.webdriver.remote.webdriver import WebDriver
 
-from mobiauto.core.locators import by_xpath
-from mobiauto.core.waits import Waits
+from mobiauto.core import waits
+from mobiauto.core.locators import (
+    PageElement,
+    by_ios_predicate_string,
+    by_xpath,
+)
+from mobiauto.core.waits import (
+    _NO_BATCH_VISIBILITY,
+    Waits,
+    _any_visible,
+    _backoff_schedule,
+    _nth_visible_condition,
+    _page_chunk_digests,
+    _wait_for_ui_stability,
+)
+from mobiauto.reporting.manager import ReportManager
 
 
 class FakeEl:
@@ -65,8 +84,9 @@ class FakeDriver:
 
 @pytest.fixture(autouse=True)
 def fast_sleep(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Speed up tests: patch time.sleep to no-op."""
+    """Speed up tests: make polling sleeps return immediately."""
     monkeypatch.setattr(time, "sleep", lambda *_a, **_k: None)
+    monkeypatch.setattr(waits._SHUTDOWN, "wait", lambda *_a, **_k: False)
 
 
 def test_waits_returns_nth_visible_element() -> None:
@@ -134,3 +154,288 @@ def test_wait_for_element_or_none_returns_none_on_absence() -> None:
     drv.set_elements("xpath", "//missing", [])
     got = Waits.wait_for_element_or_none(cast(WebDriver, drv), loc, timeout=0.2, polling_ms=50)
     assert got is None
+
+
+def test_ui_stability_needs_two_unchanged_snapshots_and_backs_off(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Stability is confirmed by two equal snapshots; the interval grows meanwhile."""
+    drv = FakeDriver()
+    sleeps: list[float] = []
+
+    def fake_wait(s: float) -> bool:
+        sleeps.append(s)
+        return False
+
+    monkeypatch.setattr(waits._SHUTDOWN, "wait", fake_wait)
+
+    _wait_for_ui_stability(cast(WebDriver, drv), 5.0, 100)
+
+    assert sleeps == pytest.approx([0.1, 0.2])
+
+
+def test_wait_for_element_or_none_does_not_attach_artifacts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A miss in wait_for_element_or_none is not a failure: no artifacts are attached."""
+    attached: list[object] = []
+    monkeypatch.setattr(
+        ReportManager, "attach_artifacts_on_failure", lambda self, d: attached.append(d)
+    )
+    drv = FakeDriver()
+    got = Waits.wait_for_element_or_none(
+        cast(WebDriver, drv), by_xpath("//missing"), timeout=0.1, polling_ms=50
+    )
+    assert got is None
+    assert attached == []
+
+
+def test_not_found_message_is_built_on_demand() -> None:
+    """The not-found error keeps its fields and formats them only when read."""
+    drv = FakeDriver()
+    with pytest.raises(NoSuchElementException) as ei:
+        Waits.wait_for_elements(cast(WebDriver, drv), by_xpath("//x"), timeout=0.1, polling_ms=50)
+    exc = ei.value
+    assert exc.failed == [("xpath", "//x")]  # type: ignore[attr-defined]
+    assert "The following locators [('xpath', '//x')]" in exc.msg
+    assert "Original error:" in str(exc)
+
+
+def test_not_found_reports_attempted_locators_and_failed_queries() -> None:
+    """`attempted` lists the resolved locators, `failed` those actually queried."""
+    drv = FakeDriver()
+    loc = PageElement.by_android_locators([by_xpath("//a"), by_xpath("//b")])
+    with pytest.raises(NoSuchElementException) as ei:
+        Waits.wait_for_elements(cast(WebDriver, drv), loc, timeout=0.1, polling_ms=50)
+    exc = ei.value
+    assert exc.attempted == [("xpath", "//a"), ("xpath", "//b")]  # type: ignore[attr-defined]
+    assert exc.failed == [("xpath", "//a"), ("xpath", "//b")]  # type: ignore[attr-defined]
+
+
+def test_backoff_schedule_doubles_up_to_cap() -> None:
+    """Element polling starts at polling_ms and doubles up to 4x the base."""
+    schedule = _backoff_schedule(100)
+    assert [next(schedule) for _ in range(5)] == pytest.approx([0.1, 0.2, 0.4, 0.4, 0.4])
+
+
+class _NoDisplayEl(FakeEl):
+    def is_displayed(self) -> bool:
+        raise AssertionError("is_displayed must not be called for elements the mask rules out")
+
+
+class _WebFakeDriver(FakeDriver):
+    """Driver able to evaluate the batch visibility script."""
+
+    def __init__(self, mask: list[bool]) -> None:
+        super().__init__()
+        self.mask = mask
+
+    def execute_script(self, name: str, args: dict) -> list[bool]:  # type: ignore[override]
+        self.exec_calls.append((name, args))
+        return self.mask
+
+
+def test_waits_uses_single_batch_visibility_call() -> None:
+    """One execute_script round-trip rules out undisplayable matches before is_displayed()."""
+    drv = _WebFakeDriver([False, True, True])
+    els = [_NoDisplayEl(), FakeEl(True), FakeEl(True)]
+    drv.set_elements("xpath", "//a", list(els))
+
+    got = Waits.wait_for_elements(
+        cast(WebDriver, drv), by_xpath("//a"), index=2, timeout=0.2, polling_ms=50
+    )
+    assert got is els[2]
+    assert len(drv.exec_calls) == 1
+
+
+def test_batch_visibility_positives_are_confirmed_with_is_displayed() -> None:
+    """An element with a layout box may still be hidden (e.g. visibility:hidden)."""
+    drv = _WebFakeDriver([True, True])
+    hidden, shown = FakeEl(False), FakeEl(True)
+    drv.set_elements("xpath", "//a", [hidden, shown])
+
+    got = Waits.wait_for_elements(cast(WebDriver, drv), by_xpath("//a"), timeout=0.2)
+    assert got is shown
+
+
+def test_batch_visibility_opt_out_is_per_context() -> None:
+    """A context that rejected the script skips it; switching to a WEBVIEW brings it back."""
+
+    class HybridDriver(FakeDriver):
+        current_context = "NATIVE_APP"
+
+        def execute_script(self, name: str, args: dict) -> list[bool]:  # type: ignore[override]
+            self.exec_calls.append((name, args))
+            if self.current_context == "NATIVE_APP":
+                raise WebDriverException("Method is not implemented")
+            return [False, True]
+
+    drv = HybridDriver()
+    el = FakeEl(True)
+    drv.set_elements("xpath", "//a", [_NoDisplayEl(), el])
+    drv.set_elements("xpath", "//b", [FakeEl(False), el])
+
+    for _ in range(2):
+        got = Waits.wait_for_elements(cast(WebDriver, drv), by_xpath("//b"), timeout=0.2)
+        assert got is el
+    assert len(drv.exec_calls) == 1
+
+    drv.current_context = "WEBVIEW_1"
+    got = Waits.wait_for_elements(cast(WebDriver, drv), by_xpath("//a"), timeout=0.2)
+    assert got is el
+    assert len(drv.exec_calls) == 2
+
+
+def test_batch_visibility_falls_back_and_is_not_retried() -> None:
+    """Drivers that cannot run the script fall back to is_displayed() per element."""
+    drv = FakeDriver()
+    e1, e2 = FakeEl(False), FakeEl(True)
+    drv.set_elements("xpath", "//a", [e1, e2])
+
+    for _ in range(2):
+        got = Waits.wait_for_elements(cast(WebDriver, drv), by_xpath("//a"), timeout=0.2)
+        assert got is e2
+    assert len(drv.exec_calls) == 1
+
+
+def test_nth_visible_stops_after_n_visible_elements() -> None:
+    """Elements after the N-th visible one are not checked."""
+    drv = FakeDriver()
+    first = FakeEl(True)
+    # One visible element is enough for index=1; the second must not be inspected
+    drv.set_elements("xpath", "//a", [first, _NoDisplayEl()])
+    _NO_BATCH_VISIBILITY[cast(WebDriver, drv)] = {None}
+
+    got = Waits.wait_for_elements(cast(WebDriver, drv), by_xpath("//a"), timeout=0.2)
+    assert got is first
+
+
+def test_waits_races_all_locators_within_one_timeout() -> None:
+    """With mixed strategies every locator is tried per poll under a single timeout."""
+    drv = FakeDriver()
+    el = FakeEl(True)
+    drv.set_elements("xpath", "//b", [el])
+    loc = PageElement.by_android_locators([("accessibility id", "missing"), by_xpath("//b")])
+
+    start = time.monotonic()
+    got = Waits.wait_for_elements(cast(WebDriver, drv), loc, timeout=5, polling_ms=50)
+    assert got is el
+    assert time.monotonic() - start < 1.0
+
+
+def test_any_visible_returns_first_visible_match() -> None:
+    """_any_visible skips failing and hidden locators and returns the first visible element."""
+    hidden, shown = FakeEl(False), FakeEl(True)
+    found = {"//hidden": hidden, "//shown": shown}
+
+    class Drv:
+        def find_element(self, by: str, value: str) -> FakeEl:
+            if value not in found:
+                raise NoSuchElementException(value)
+            return found[value]
+
+    pred = _any_visible([by_xpath("//missing"), by_xpath("//hidden"), by_xpath("//shown")])
+    assert pred(cast(WebDriver, Drv())) is shown
+    assert _any_visible([by_xpath("//hidden")])(cast(WebDriver, Drv())) is False
+
+
+def test_ui_stability_returns_on_shutdown(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A pending shutdown ends the settle loop instead of sleeping through it."""
+    drv = FakeDriver()
+    monkeypatch.setattr(waits._SHUTDOWN, "wait", lambda _s: True)
+    start = time.monotonic()
+    _wait_for_ui_stability(cast(WebDriver, drv), 5.0, 100)
+    assert time.monotonic() - start < 1.0
+
+
+def test_waits_resolves_locators_once_across_scrolls(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Locators are resolved once per wait, not on every scroll retry."""
+    drv = FakeDriver()
+    calls: list[object] = []
+    orig = waits.resolve_to_selenium
+
+    def counting_resolve(d: object, t: object) -> object:
+        calls.append(t)
+        return orig(d, t)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(waits, "resolve_to_selenium", counting_resolve)
+    got = Waits.wait_for_element_or_none(
+        cast(WebDriver, drv), by_xpath("//none"), timeout=0.05, polling_ms=50, max_scrolls=2
+    )
+    assert got is None
+    assert len(drv.exec_calls) == 2
+    assert len(calls) == 1
+
+
+def test_visibility_predicate_only_swallows_driver_errors() -> None:
+    """Driver errors count as "not visible"; unexpected errors propagate."""
+
+    class StaleEl(FakeEl):
+        def is_displayed(self) -> bool:
+            raise StaleElementReferenceException("stale")
+
+    class BrokenEl(FakeEl):
+        def is_displayed(self) -> bool:
+            raise KeyError("bug in harness")
+
+    drv = FakeDriver()
+    predicate = _nth_visible_condition(("xpath", "//a"), 1)
+    drv.set_elements("xpath", "//a", [StaleEl()])
+    assert predicate(cast(WebDriver, drv)) is False
+    drv.set_elements("xpath", "//a", [BrokenEl()])
+    with pytest.raises(KeyError):
+        predicate(cast(WebDriver, drv))
+
+
+def test_waits_scroll_rounds_share_one_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Scroll retries draw from the caller's timeout instead of each getting it in full."""
+    drv = FakeDriver()
+    budgets: list[float] = []
+    orig = waits._poll_until
+
+    def recording_poll(d: object, p: object, timeout: float, s: object) -> object:
+        budgets.append(timeout)
+        return orig(d, p, timeout, s)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(waits, "_poll_until", recording_poll)
+    got = Waits.wait_for_element_or_none(
+        cast(WebDriver, drv), by_xpath("//none"), timeout=0.05, polling_ms=50, max_scrolls=2
+    )
+    assert got is None
+    assert len(drv.exec_calls) == 2
+    assert budgets[0] <= 0.05
+    # The first round spent the budget; later rounds only check the screen once
+    assert budgets[1:] == [0.0, 0.0]
+
+
+def test_page_chunk_digests_localize_changes() -> None:
+    """Page sources are digested per chunk, so only the changed chunk differs."""
+    base = "a" * 10 + "b" * 10 + "c" * 5
+    changed = "a" * 10 + "X" + "b" * 9 + "c" * 5
+
+    before = _page_chunk_digests(base, chunk_size=10)
+    after = _page_chunk_digests(changed, chunk_size=10)
+
+    assert len(before) == len(after) == 3
+    assert [x == y for x, y in zip(before, after, strict=True)] == [True, False, True]
+    assert _page_chunk_digests("") == []
+
+
+def test_waits_prefers_earlier_locators_over_document_order() -> None:
+    """The first locator with a visible match wins, even if another matches an earlier node."""
+    drv = FakeDriver()
+    drv.capabilities = {"platformName": "iOS"}
+    loc = PageElement.by_ios_locators(
+        [by_ios_predicate_string("name == 'a'"), by_ios_predicate_string("name == 'b'")]
+    )
+    a1, b1, b2 = FakeEl(True), FakeEl(True), FakeEl(True)
+    drv.set_elements("-ios predicate string", "name == 'a'", [a1])
+    drv.set_elements("-ios predicate string", "name == 'b'", [b1, b2])
+    # A union query would list b1 first (document order); it must not be issued
+    drv.set_elements("-ios predicate string", "(name == 'a') OR (name == 'b')", [b1, a1, b2])
+
+    got = Waits.wait_for_elements(cast(WebDriver, drv), loc, timeout=0.2, polling_ms=50)
+    assert got is a1
+    # The N-th element is counted within the first locator that has enough matches
+    got = Waits.wait_for_elements(cast(WebDriver, drv), loc, timeout=0.2, polling_ms=50, index=2)
+    assert got is b2
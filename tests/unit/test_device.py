@@ -1,19 +1,106 @@
 from __future__ import annotations
 
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
 from typing import Any
 
 import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
 
-from mobiauto.device.android_emulator import AndroidEmulatorManager
-from mobiauto.device.ios_simulator import IOSSimulatorManager
+from mobiauto.device.android_emulator import (
+    AndroidEmulatorManager,
+    _boot_completed,
+    _ready_cache,
+    _subject_hash_old,
+)
+from mobiauto.device.ios_simulator import (
+    IOSSimulatorManager,
+    _list_simulators,
+    find_simulator_udid_by_name,
+)
+
+
+class FakeAdbShell:
+    """
+    Stand-in for a persistent `adb shell` Popen: answers getprop with `boot_values`.
+
+    Reading its stdout blocks until output is written or the session is closed, like a pipe.
+    """
+
+    instances: list[FakeAdbShell] = []
+
+    def __init__(self, args: list[str], boot_values: list[str], **kw: Any) -> None:
+        self.args = args
+        self.commands: list[str] = []
+        self.closed = False
+        self._boot_values = boot_values
+        self._out: list[str] = []
+        self._cond = threading.Condition()
+        self.stdin = self
+        self.stdout = self
+        FakeAdbShell.instances.append(self)
+
+    def write(self, data: str) -> None:
+        self.commands.append(data)
+        value = self._boot_values.pop(0) if len(self._boot_values) > 1 else self._boot_values[0]
+        with self._cond:
+            self._out += ["__MOBIAUTO_BEGIN__\n", f"{value}\n", "__MOBIAUTO_END__\n"]
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        pass
+
+    def __iter__(self) -> FakeAdbShell:
+        return self
+
+    def __next__(self) -> str:
+        with self._cond:
+            self._cond.wait_for(lambda: self._out or self.closed)
+            if not self._out:
+                raise StopIteration
+            return self._out.pop(0)
+
+    def poll(self) -> int | None:
+        return 0 if self.closed else None
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def terminate(self) -> None:
+        self.close()
+
+    def wait(self, timeout: float | None = None) -> int:
+        return 0
+
+
+def _patch_adb_shell(monkeypatch: pytest.MonkeyPatch, boot_values: list[str]) -> None:
+    FakeAdbShell.instances = []
+    monkeypatch.setattr(
+        "mobiauto.device.android_emulator.subprocess.Popen",
+        lambda args, **kw: FakeAdbShell(args, boot_values, **kw),
+    )
+
+
+def _fake_adb_probe(output: str) -> Any:
+    """run_cmd stand-in answering every command with `output`."""
+    import subprocess
+
+    return lambda args, **kw: subprocess.CompletedProcess(args, 0, stdout=output, stderr="")
 
 
 def test_android_emulator_commands(monkeypatch: pytest.MonkeyPatch) -> None:
     """
     Verify that AndroidEmulatorManager issues the expected emulator/adb commands:
     - starts the emulator
-    - polls sys.boot_completed until ready
-    - sends 'emu kill' to stop
+    - polls sys.boot_completed until ready through one adb shell session
+    - terminates the spawned emulator process to stop
     """
     calls: list[tuple[tuple[str, ...], dict[str, Any]]] = []
 
@@ -22,35 +109,171 @@ def test_android_emulator_commands(monkeypatch: pytest.MonkeyPatch) -> None:
             self.returncode: int = rc
             self.stdout: str = out
             self.stderr: str = ""
+            self.terminated = False
+
+        def poll(self) -> int | None:
+            return 0 if self.terminated else None
+
+        def terminate(self) -> None:
+            self.terminated = True
+
+        def wait(self, timeout: float | None = None) -> int:
+            return 0
 
     def fake_run_cmd(args: list[str], **kw: Any) -> R:
         calls.append((tuple(args), kw))
-        # Emulate boot loop, then ready
-        if "getprop" in args:
-            # Overwrite stdout as "1" on the second call to indicate readiness
-            if len([c for c in calls if "getprop" in c[0]]) >= 2:
-                return R(0, "1")
-            return R(0, "0")
         return R(0, "")
 
     monkeypatch.setattr("mobiauto.device.android_emulator.run_cmd", fake_run_cmd)
 
     mgr = AndroidEmulatorManager(avd="Pixel_8", port=5554)
     mgr.start()
+    # Emulate boot loop, then ready on the second probe
+    _patch_adb_shell(monkeypatch, ["0", "1"])
     mgr.wait_until_ready(timeout=3)
     mgr.stop()
 
     # Ensure emulator/adb commands were invoked
     assert any("emulator" in c[0][0] for c in calls)
-    assert any("adb" in c[0][0] and "getprop" in c[0] for c in calls)
-    assert any("emu" in c[0] and "kill" in c[0] for c in calls)
+    [shell] = FakeAdbShell.instances
+    assert shell.args == ["adb", "-s", "emulator-5554", "shell"]
+    assert sum("getprop sys.boot_completed" in c for c in shell.commands) == 2
+    assert all("getprop dev.bootcomplete" in c for c in shell.commands)
+    assert shell.closed
+    assert getattr(mgr.proc, "terminated", False)
+    assert not any("emu" in c[0] and "kill" in c[0] for c in calls)
+
+
+@pytest.mark.parametrize("headless", [True, False])
+def test_android_emulator_start_headless_flag(
+    monkeypatch: pytest.MonkeyPatch, headless: bool
+) -> None:
+    """-no-window is passed only in headless mode."""
+    calls: list[list[str]] = []
+    monkeypatch.setattr("mobiauto.device.android_emulator._HEADLESS", headless)
+    monkeypatch.setattr(
+        "mobiauto.device.android_emulator.run_cmd", lambda args, **kw: calls.append(args)
+    )
+
+    AndroidEmulatorManager(avd="Pixel_8", port=5556).start()
+
+    [cmd] = calls
+    assert cmd[0] == "emulator"
+    assert cmd[-4:] == ["-avd", "Pixel_8", "-port", "5556"]
+    assert ("-no-window" in cmd) is headless
+
+
+def test_android_stop_without_process_sends_emu_kill(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An emulator this manager did not start is stopped through `adb emu kill`."""
+    calls: list[list[str]] = []
+    monkeypatch.setattr(
+        "mobiauto.device.android_emulator.run_cmd", lambda args, **kw: calls.append(args)
+    )
+
+    AndroidEmulatorManager(avd="Pixel_8", port=5554).stop()
+
+    assert calls == [["adb", "-s", "emulator-5554", "emu", "kill"]]
+
+
+def test_android_wait_until_ready_fast_path_for_booted_emulator(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """An already-booted emulator is detected by one probe, without a shell session or sleep."""
+    sleeps: list[float] = []
+    monkeypatch.setattr(
+        "mobiauto.device.android_emulator.run_cmd", _fake_adb_probe("1\n1\nstopped\n")
+    )
+    _patch_adb_shell(monkeypatch, ["0"])
+    monkeypatch.setattr("mobiauto.device.android_emulator.time.sleep", sleeps.append)
+
+    mgr = AndroidEmulatorManager(avd="Pixel_8", port=5558)
+    mgr.wait_until_ready(timeout=3)
+    mgr.stop()
+
+    assert FakeAdbShell.instances == []
+    assert sleeps == []
+
+
+def test_android_wait_until_ready_wakes_on_console_boot_marker(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Boot reported on the emulator console ends the wait without adb polling."""
+    import subprocess
+
+    class FakeEmulator:
+        stdout = [b"INFO    | Starting emulator\n", b"INFO    | Boot completed in 1234 ms\n"]
+
+        def poll(self) -> int | None:
+            return 0
+
+    spawn_kwargs: dict[str, Any] = {}
+
+    def fake_run_cmd(args: list[str], **kw: Any) -> Any:
+        if kw.get("spawn"):
+            spawn_kwargs.update(kw)
+            return FakeEmulator()
+        return subprocess.CompletedProcess(args, 0, stdout="", stderr="")
+
+    monkeypatch.setattr("mobiauto.device.android_emulator.run_cmd", fake_run_cmd)
+
+    mgr = AndroidEmulatorManager(avd="Pixel_8", port=5560)
+    mgr.start()
+    _patch_adb_shell(monkeypatch, ["0"])
+    mgr.wait_until_ready(timeout=3)
+    mgr.stop()
+
+    assert spawn_kwargs["stdout"] == subprocess.PIPE
+    assert spawn_kwargs["stderr"] == subprocess.STDOUT
+    assert "INFO    | Boot completed in 1234 ms" in mgr._output
+    assert all("getprop" not in c for shell in FakeAdbShell.instances for c in shell.commands)
+
+
+def test_android_wait_until_ready_reuses_recent_result(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A second wait within the TTL skips probing; stop() forgets the cached result."""
+    monkeypatch.setattr("mobiauto.device.android_emulator.run_cmd", _fake_adb_probe(""))
+    _patch_adb_shell(monkeypatch, ["1"])
+
+    mgr = AndroidEmulatorManager(avd="Pixel_8", port=5556)
+    mgr.wait_until_ready(timeout=3)
+    mgr.wait_until_ready(timeout=3)
+    assert len(FakeAdbShell.instances) == 1
+
+    mgr.stop()
+    mgr.wait_until_ready(timeout=3)
+    assert len(FakeAdbShell.instances) == 2
+    mgr.stop()
+
+
+def test_android_wait_until_ready_restarts_wedged_shell(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A shell session that never answers is abandoned, and the overall timeout still holds."""
+
+    class WedgedAdbShell(FakeAdbShell):
+        def write(self, data: str) -> None:
+            self.commands.append(data)
+
+    monkeypatch.setattr("mobiauto.device.android_emulator.run_cmd", _fake_adb_probe(""))
+    monkeypatch.setattr("mobiauto.device.android_emulator._SHELL_READ_TIMEOUT_S", 0.2)
+    FakeAdbShell.instances = []
+    monkeypatch.setattr(
+        "mobiauto.device.android_emulator.subprocess.Popen",
+        lambda args, **kw: WedgedAdbShell(args, ["0"], **kw),
+    )
+
+    mgr = AndroidEmulatorManager(avd="Pixel_8", port=5562)
+    t0 = time.monotonic()
+    with pytest.raises(TimeoutError):
+        mgr.wait_until_ready(timeout=1)
+
+    assert time.monotonic() - t0 < 3
+    assert len(FakeAdbShell.instances) >= 2
+    assert all(shell.closed for shell in FakeAdbShell.instances)
 
 
 def test_ios_simulator_commands(monkeypatch: pytest.MonkeyPatch) -> None:
     """
     Verify that IOSSimulatorManager issues the expected xcrun simctl commands:
     - boots the simulator
-    - checks readiness via launchctl
+    - waits for readiness via simctl bootstatus
     - shuts down the simulator
     """
     calls: list[tuple[str, ...]] = []
@@ -63,9 +286,7 @@ def test_ios_simulator_commands(monkeypatch: pytest.MonkeyPatch) -> None:
 
     def fake_run_cmd(args: list[str], **kw: Any) -> R:
         calls.append(tuple(args))
-        # Pretend the system is ready immediately when checking via launchctl
-        if "launchctl" in args:
-            return R(0)
+        # Pretend the simulator finished booting immediately
         return R(0)
 
     monkeypatch.setattr("mobiauto.device.ios_simulator.run_cmd", fake_run_cmd)
@@ -76,5 +297,604 @@ def test_ios_simulator_commands(monkeypatch: pytest.MonkeyPatch) -> None:
     mgr.stop()
 
     assert any(args[:3] == ("xcrun", "simctl", "boot") for args in calls)
-    assert any(any("launchctl" in tok for tok in args) for args in calls)
+    assert ("xcrun", "simctl", "bootstatus", "FAKE-UDID", "-b") in calls
+    assert not any("list" in args for args in calls)
     assert any(args[:3] == ("xcrun", "simctl", "shutdown") for args in calls)
+
+
+def test_ios_wait_until_ready_falls_back_to_device_state(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Without bootstatus or device.plist, readiness is polled from `simctl list -j devices`."""
+    import json
+    import subprocess
+
+    states = iter(["Booting", "Booting", "Booting", "Booted"])
+    sleeps: list[float] = []
+
+    def fake_run_cmd(args: list[str], **kw: Any) -> subprocess.CompletedProcess:
+        if "bootstatus" in args:
+            return subprocess.CompletedProcess(args, 1, stdout="", stderr="unknown subcommand")
+        listing = {"devices": {"iOS-18-5": [{"udid": "FAKE-UDID", "state": next(states)}]}}
+        return subprocess.CompletedProcess(args, 0, stdout=json.dumps(listing), stderr="")
+
+    monkeypatch.setattr("mobiauto.device.ios_simulator.run_cmd", fake_run_cmd)
+    monkeypatch.setattr("mobiauto.device.ios_simulator.time.sleep", sleeps.append)
+    monkeypatch.setattr("mobiauto.device.ios_simulator._CORESIM_DEVICES_DIR", tmp_path)
+
+    IOSSimulatorManager(udid="FAKE-UDID").wait_until_ready(timeout=10)
+
+    assert sleeps == [0.05, 0.1, 0.2]
+
+
+def test_ios_wait_until_ready_reads_device_plist(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """The fallback reads CoreSimulator's device.plist instead of spawning simctl."""
+    import plistlib
+    import subprocess
+
+    calls: list[list[str]] = []
+    plist = tmp_path / "FAKE-UDID" / "device.plist"
+    plist.parent.mkdir()
+    plist.write_bytes(plistlib.dumps({"UDID": "FAKE-UDID", "state": 2}))
+
+    def fake_run_cmd(args: list[str], **kw: Any) -> subprocess.CompletedProcess:
+        calls.append(args)
+        return subprocess.CompletedProcess(args, 1, stdout="", stderr="unknown subcommand")
+
+    def fake_sleep(seconds: float) -> None:
+        plist.write_bytes(plistlib.dumps({"UDID": "FAKE-UDID", "state": 3}))
+
+    monkeypatch.setattr("mobiauto.device.ios_simulator.run_cmd", fake_run_cmd)
+    monkeypatch.setattr("mobiauto.device.ios_simulator.time.sleep", fake_sleep)
+    monkeypatch.setattr("mobiauto.device.ios_simulator._CORESIM_DEVICES_DIR", tmp_path)
+
+    IOSSimulatorManager(udid="FAKE-UDID").wait_until_ready(timeout=10)
+
+    assert calls == [["xcrun", "simctl", "bootstatus", "FAKE-UDID", "-b"]]
+
+
+def test_ios_proxy_runs_networksetup_directly_under_sudo(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Every call is `sudo -- networksetup ...` (no shell); the sudo probe result is reused."""
+    import subprocess
+
+    calls: list[list[str]] = []
+
+    def fake_run(cmd: list[str], **kw: Any) -> subprocess.CompletedProcess:
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(IOSSimulatorManager, "_sudo_ok_cache", None)
+    mgr = IOSSimulatorManager(udid="FAKE-UDID")
+    monkeypatch.setattr(mgr, "_list_macos_services", lambda: ["Wi-Fi", "USB 10/100 LAN"])
+
+    mgr.apply_proxy("127.0.0.1", 8080)
+    mgr.remove_proxy()
+
+    assert calls[0] == ["sudo", "-n", "true"]
+    assert len(calls) == 1 + 2 * 5 + 2 * 2
+    assert all(c[:3] == ["sudo", "--", "networksetup"] for c in calls[1:])
+    # Services are configured concurrently, but each one's commands run in order
+    wifi = [c[3] for c in calls[1:] if "Wi-Fi" in c]
+    assert wifi == [
+        "-setwebproxy",
+        "-setsecurewebproxy",
+        "-setproxybypassdomains",
+        "-setwebproxystate",
+        "-setsecurewebproxystate",
+        "-setwebproxystate",
+        "-setsecurewebproxystate",
+    ]
+    assert ["sudo", "--", "networksetup", "-setwebproxystate", "USB 10/100 LAN", "on"] in calls
+    # remove_proxy only switches the proxies off
+    assert all(c[-1] == "off" for c in calls[11:])
+
+
+def test_ios_list_macos_services_is_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    """networksetup -listallnetworkservices runs once until the cache is invalidated."""
+    import subprocess
+
+    listings: list[list[str]] = []
+
+    def fake_check_output(cmd: list[str], **kw: Any) -> str:
+        listings.append(cmd)
+        return "An asterisk (*) denotes that a network service is disabled.\nWi-Fi\n*Thunderbolt\n"
+
+    monkeypatch.setattr(subprocess, "check_output", fake_check_output)
+    mgr = IOSSimulatorManager(udid="FAKE-UDID")
+
+    assert mgr._list_macos_services() == ["Wi-Fi", "Thunderbolt"]
+    assert mgr._list_macos_services() == ["Wi-Fi", "Thunderbolt"]
+    assert len(listings) == 1
+
+    mgr._invalidate_services_cache()
+    mgr._list_macos_services()
+    assert len(listings) == 2
+
+
+@pytest.mark.parametrize(
+    ("version", "udid"),
+    [("18.5", "B-18-5"), ("17.0", "A-17-0"), ("16.4", "B-18-5"), (None, "B-18-5")],
+)
+def test_find_simulator_udid_by_name(
+    monkeypatch: pytest.MonkeyPatch, version: str | None, udid: str
+) -> None:
+    """Version filter first (falling back to any runtime), booted simulators preferred."""
+    import json
+    import subprocess
+
+    listing = {
+        "devices": {
+            "com.apple.CoreSimulator.SimRuntime.iOS-17-0": [
+                {"name": "iPhone 15", "udid": "A-17-0", "state": "Shutdown"},
+            ],
+            "com.apple.CoreSimulator.SimRuntime.iOS-18-5": [
+                {"name": "iPhone 16", "udid": "X-18-5", "state": "Booted"},
+                {"name": "iPhone 15", "udid": "A-18-5", "state": "Shutdown"},
+                {"name": "iPhone 15", "udid": "B-18-5", "state": "Booted"},
+            ],
+        }
+    }
+    monkeypatch.setattr(
+        "mobiauto.device.ios_simulator.run_cmd",
+        lambda args, **kw: subprocess.CompletedProcess(args, 0, stdout=json.dumps(listing)),
+    )
+    _list_simulators.cache_clear()
+
+    assert find_simulator_udid_by_name("iPhone 15", version) == udid
+    assert find_simulator_udid_by_name("iPhone 99", version) is None
+
+
+def test_find_simulator_reuses_recent_simctl_listing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """simctl list runs once per TTL bucket; failures are not memoized."""
+    import subprocess
+
+    calls: list[list[str]] = []
+    outputs = iter(
+        [
+            subprocess.CompletedProcess([], 1, stdout="", stderr="simctl unavailable"),
+            subprocess.CompletedProcess(
+                [], 0, stdout='{"devices": {"iOS-18-5": [{"name": "iPhone 15", "udid": "U"}]}}'
+            ),
+        ]
+    )
+
+    def fake_run_cmd(args: list[str], **kw: Any) -> subprocess.CompletedProcess:
+        calls.append(args)
+        return next(outputs)
+
+    monkeypatch.setattr("mobiauto.device.ios_simulator.run_cmd", fake_run_cmd)
+    monkeypatch.setattr("mobiauto.device.ios_simulator.time.monotonic", lambda: 1000.0)
+    _list_simulators.cache_clear()
+
+    assert find_simulator_udid_by_name("iPhone 15") is None
+    assert find_simulator_udid_by_name("iPhone 15") == "U"
+    assert find_simulator_udid_by_name("iPhone 15", "18.5") == "U"
+    assert len(calls) == 2
+
+
+def test_android_wait_until_ready_backs_off(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Boot polling starts at 100ms and grows by 1.5x up to a 2s cap."""
+    sleeps: list[float] = []
+    monkeypatch.setattr("mobiauto.device.android_emulator.run_cmd", _fake_adb_probe("0"))
+    _patch_adb_shell(monkeypatch, ["0"] * 9 + ["1"])
+    monkeypatch.setattr("mobiauto.device.android_emulator.time.sleep", sleeps.append)
+
+    AndroidEmulatorManager(avd="Pixel_8").wait_until_ready(timeout=30)
+
+    assert sleeps[:3] == pytest.approx([0.1, 0.15, 0.225])
+    assert max(sleeps) == pytest.approx(2.0)
+    assert len(sleeps) == 10
+
+
+def test_android_apply_proxy_sets_and_verifies_in_one_shell_call(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """apply_proxy waits for the transport once, then sets and verifies in one shell call."""
+    import subprocess
+
+    adb_calls: list[tuple[str, ...]] = []
+
+    def fake_run(cmd: list[str], **kw: Any) -> subprocess.CompletedProcess:
+        adb_calls.append(tuple(cmd))
+        return subprocess.CompletedProcess(cmd, 0, stdout="10.0.2.2:8080\n", stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr("time.sleep", lambda _s: None)
+
+    AndroidEmulatorManager(avd="Pixel_8").apply_proxy("10.0.2.2", 8080)
+
+    assert adb_calls == [
+        ("adb", "-s", "emulator-5554", "wait-for-device"),
+        ("adb", "shell", "getprop", "sys.boot_completed"),
+        (
+            "adb",
+            "shell",
+            "settings put global http_proxy 10.0.2.2:8080; settings get global http_proxy",
+        ),
+    ]
+
+
+def test_android_apply_proxy_skips_when_shell_probe_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A failing getprop sanity probe leaves the proxy untouched."""
+    import subprocess
+
+    adb_calls: list[tuple[str, ...]] = []
+
+    def fake_run(cmd: list[str], **kw: Any) -> subprocess.CompletedProcess:
+        adb_calls.append(tuple(cmd))
+        rc = 1 if "getprop" in cmd else 0
+        return subprocess.CompletedProcess(cmd, rc, stdout="", stderr="error: closed")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    AndroidEmulatorManager(avd="Pixel_8").apply_proxy("10.0.2.2", 8080)
+
+    assert not any("settings" in " ".join(c) for c in adb_calls)
+
+
+def test_android_apply_proxy_rereads_until_value_settles(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A put whose value is not visible yet is re-read at a short interval, not re-sent."""
+    import subprocess
+
+    adb_calls: list[tuple[str, ...]] = []
+    sleeps: list[float] = []
+    readbacks = iter(["null\n", "null\n", "10.0.2.2:8080\n"])
+
+    def fake_run(cmd: list[str], **kw: Any) -> subprocess.CompletedProcess:
+        adb_calls.append(tuple(cmd))
+        out = next(readbacks) if "http_proxy" in cmd[-1] else "1\n"
+        return subprocess.CompletedProcess(cmd, 0, stdout=out, stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr("time.sleep", sleeps.append)
+
+    AndroidEmulatorManager(avd="Pixel_8").apply_proxy("10.0.2.2", 8080)
+
+    assert sum("settings put" in c[-1] for c in adb_calls) == 1
+    assert adb_calls[-1] == ("adb", "shell", "settings", "get", "global", "http_proxy")
+    assert sleeps == [0.05, 0.05]
+
+
+@pytest.mark.parametrize(
+    ("probe", "ready"),
+    [
+        ("1\n1\nstopped", True),
+        ("\n1\nstopped", True),
+        ("\n1\nrunning", False),
+        ("0\n0\nrunning", False),
+        ("", False),
+    ],
+)
+def test_android_boot_completed_probe(probe: str, ready: bool) -> None:
+    """sys.boot_completed wins; dev.bootcomplete counts once the boot animation stopped."""
+    assert _boot_completed(probe) is ready
+
+
+def _mitm_ca_cert() -> x509.Certificate:
+    """Self-signed certificate with the mitmproxy CA subject."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name(
+        [
+            x509.NameAttribute(NameOID.COMMON_NAME, "mitmproxy"),
+            x509.NameAttribute(NameOID.ORGANIZATION_NAME, "mitmproxy"),
+        ]
+    )
+    now = datetime.now(UTC)
+    return (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(1)
+        .not_valid_before(now)
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+
+
+def test_android_ca_file_name_matches_openssl_subject_hash_old() -> None:
+    """The mitmproxy CA subject hashes to the well-known Android file name c8750f0d."""
+    assert _subject_hash_old(_mitm_ca_cert()) == "c8750f0d"
+
+
+def test_android_install_mitm_ca_sets_permissions_in_one_shell_call(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """The pushed CA gets its mode and owner from a single adb shell call."""
+    import subprocess
+
+    (tmp_path / "mitmproxy-ca-cert.pem").write_bytes(
+        _mitm_ca_cert().public_bytes(serialization.Encoding.PEM)
+    )
+    adb_calls: list[tuple[str, ...]] = []
+
+    def fake_run(cmd: list[str], **kw: Any) -> subprocess.CompletedProcess:
+        adb_calls.append(tuple(cmd))
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr("time.sleep", lambda _s: None)
+    monkeypatch.setattr(Path, "home", lambda: tmp_path / "no-home")
+
+    _ready_cache["emulator-5554"] = time.monotonic()
+    mgr = AndroidEmulatorManager(avd="Pixel_8")
+    mgr._boot_evt.set()
+    mgr.install_mitm_ca_if_available(str(tmp_path))
+    # The reboot invalidates the cached readiness and the console boot marker
+    assert "emulator-5554" not in _ready_cache
+    assert not mgr._boot_evt.is_set()
+
+    target = "/system/etc/security/cacerts/c8750f0d.0"
+    assert [c[1:] for c in adb_calls if c[1] != "push"] == [
+        ("root",),
+        ("remount",),
+        ("shell", f"chmod 644 {target}; chown root:root {target}"),
+        ("reboot",),
+    ]
+    assert any(c[1] == "push" and c[-1] == target for c in adb_calls)
+
+
+def test_appium_report_failure_wakes_monitor(monkeypatch: pytest.MonkeyPatch) -> None:
+    """report_failure() triggers a probe right away instead of after the poll interval."""
+    import threading
+
+    from mobiauto.device.appium_server_manager import AppiumServerManager
+
+    mgr = AppiumServerManager()
+    probes: list[str] = []
+    probed = threading.Event()
+
+    def fake_healthy(url: str) -> bool:
+        probes.append(url)
+        probed.set()
+        return True
+
+    monkeypatch.setattr(mgr, "_is_healthy", fake_healthy)
+    monkeypatch.setattr(AppiumServerManager, "DEFAULT_POLL_INTERVAL_SEC", 60.0)
+
+    mgr._start_monitoring("http://127.0.0.1:4723")
+    assert probed.wait(1)
+    probed.clear()
+
+    mgr.report_failure()
+    assert probed.wait(1)
+    assert len(probes) == 2
+
+    mgr.shutdown()
+    assert mgr._state.monitor_thread is None
+
+
+class FakeAppiumHttp:
+    """Stand-in for the pooled urllib3 client: answers by path, or raises for `error`."""
+
+    def __init__(self, statuses: dict[str, int], error: Exception | None = None) -> None:
+        self.statuses = statuses
+        self.error = error
+        self.calls: list[tuple[str, str]] = []
+
+    def request(self, method: str, url: str, **kw: Any) -> Any:
+        from types import SimpleNamespace
+
+        self.calls.append((method, url))
+        if self.error is not None:
+            raise self.error
+        path = url.rsplit("/", 1)[-1]
+        return SimpleNamespace(status=self.statuses.get(path, 404), data=b"")
+
+
+class FakeAppiumProc:
+    """Stand-in for the Appium Popen: `wait` times out `stuck` times before exiting."""
+
+    def __init__(self, *, alive: bool = True, stuck: int = 0) -> None:
+        self.alive = alive
+        self.stuck = stuck
+        self.signals: list[str] = []
+
+    def poll(self) -> int | None:
+        return None if self.alive else 0
+
+    def terminate(self) -> None:
+        self.signals.append("terminate")
+
+    def kill(self) -> None:
+        self.signals.append("kill")
+        self.alive = False
+
+    def wait(self, timeout: float | None = None) -> int:
+        import subprocess
+
+        if self.stuck:
+            self.stuck -= 1
+            raise subprocess.TimeoutExpired("appium", timeout or 0)
+        self.alive = False
+        return 0
+
+
+@pytest.mark.parametrize(
+    ("statuses", "error", "healthy", "calls"),
+    [
+        ({"status": 200}, None, True, [("HEAD", "/status")]),
+        ({"status": 405, "sessions": 200}, None, True, [("HEAD", "/status"), ("GET", "/sessions")]),
+        ({"status": 500}, None, False, [("HEAD", "/status")]),
+        ({}, ConnectionRefusedError(), False, [("HEAD", "/status")]),
+    ],
+)
+def test_appium_is_healthy_probe(
+    monkeypatch: pytest.MonkeyPatch,
+    statuses: dict[str, int],
+    error: Exception | None,
+    healthy: bool,
+    calls: list[tuple[str, str]],
+) -> None:
+    """Health is a HEAD /status, falling back to GET /sessions when HEAD is not allowed."""
+    from mobiauto.device.appium_server_manager import AppiumServerManager
+
+    http = FakeAppiumHttp(statuses, error)
+    monkeypatch.setattr("mobiauto.device.appium_server_manager._http", http)
+
+    assert AppiumServerManager()._is_healthy("http://127.0.0.1:4723/") is healthy
+    assert http.calls == [(m, "http://127.0.0.1:4723" + path) for m, path in calls]
+
+
+def test_appium_wait_until_healthy_backs_off_with_jitter(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Startup probes double their interval (plus up to 20% jitter) until the server answers."""
+    from mobiauto.device.appium_server_manager import AppiumServerManager
+
+    mgr = AppiumServerManager()
+    answers = [False, False, False, True]
+    monkeypatch.setattr(mgr, "_is_healthy", lambda url: answers.pop(0))
+    waits: list[float] = []
+
+    def fake_wait(timeout: float | None = None) -> bool:
+        waits.append(timeout or 0.0)
+        return False
+
+    monkeypatch.setattr(mgr._stop, "wait", fake_wait)
+
+    mgr._wait_until_healthy("http://127.0.0.1:4723", timeout=5)
+
+    assert len(waits) == 3
+    for waited, base in zip(waits, [0.1, 0.2, 0.4], strict=True):
+        assert base <= waited <= base * 1.2
+
+
+def test_appium_terminate_kills_after_grace() -> None:
+    """A server that ignores terminate within the grace period is killed."""
+    from mobiauto.device.appium_server_manager import AppiumServerManager
+
+    proc = FakeAppiumProc(stuck=1)
+    AppiumServerManager()._terminate(proc, grace=0.01)  # type: ignore[arg-type]
+    assert proc.signals == ["terminate", "kill"]
+
+    proc = FakeAppiumProc()
+    AppiumServerManager()._terminate(proc, grace=0.01)  # type: ignore[arg-type]
+    assert proc.signals == ["terminate"]
+
+
+def test_appium_monitor_restarts_dead_server(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """After FAILURE_THRESHOLD failed checks the monitor starts a new Appium process."""
+    from mobiauto.device.appium_server_manager import AppiumServerManager
+
+    mgr = AppiumServerManager()
+    dead = FakeAppiumProc(alive=False)
+    mgr._state.proc, mgr._state.started_by_us = dead, True
+    mgr._state.host, mgr._state.port = "127.0.0.1", 4723
+    restarted = threading.Event()
+    spawned: list[FakeAppiumProc] = []
+
+    def fake_run_cmd(args: list[str], **kw: Any) -> FakeAppiumProc:
+        proc = FakeAppiumProc()
+        spawned.append(proc)
+        restarted.set()
+        return proc
+
+    monkeypatch.setattr("mobiauto.device.appium_server_manager.run_cmd", fake_run_cmd)
+    # The restarted server logs to artifacts/ under the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mgr, "_is_healthy", lambda url: bool(spawned))
+    monkeypatch.setattr(AppiumServerManager, "FAILURE_THRESHOLD", 1)
+
+    mgr._start_monitoring("http://127.0.0.1:4723")
+    assert restarted.wait(2)
+    mgr.shutdown()
+
+    assert dead.signals == ["terminate"]
+    assert len(spawned) == 1
+    assert spawned[0].signals == ["terminate"]
+    assert mgr._state.monitor_thread is None
+
+
+def test_appium_shutdown_leaves_slow_monitor_flagged(monkeypatch: pytest.MonkeyPatch) -> None:
+    """If the monitor outlives the join timeout it keeps its stop flag and never restarts."""
+    from mobiauto.device.appium_server_manager import AppiumServerManager
+
+    mgr = AppiumServerManager()
+    in_probe, release = threading.Event(), threading.Event()
+    restarts: list[tuple[str, int]] = []
+
+    def slow_unhealthy(url: str) -> bool:
+        in_probe.set()
+        release.wait(2)
+        return False
+
+    monkeypatch.setattr(mgr, "_is_healthy", slow_unhealthy)
+    monkeypatch.setattr(mgr, "_start_process", lambda host, port: restarts.append((host, port)))
+    monkeypatch.setattr(AppiumServerManager, "FAILURE_THRESHOLD", 1)
+    monkeypatch.setattr(AppiumServerManager, "SHUTDOWN_JOIN_TIMEOUT_SEC", 0.05)
+
+    mgr._start_monitoring("http://127.0.0.1:4723")
+    assert in_probe.wait(1)
+    t = mgr._state.monitor_thread
+    mgr.shutdown()
+    assert t is not None and t.is_alive()
+    assert mgr._stop.is_set()
+
+    release.set()
+    t.join(2)
+    assert not t.is_alive()
+    assert restarts == []
+
+
+def test_ios_sudo_probe_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    """`sudo -n true` is shared across managers and re-run once its result is stale."""
+    import subprocess
+
+    probes: list[list[str]] = []
+    now = [1000.0]
+
+    def fake_run(cmd: list[str], **kw: Any) -> subprocess.CompletedProcess:
+        probes.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0 if len(probes) == 1 else 1)
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr("mobiauto.device.ios_simulator.time.monotonic", lambda: now[0])
+    monkeypatch.setattr(IOSSimulatorManager, "_sudo_ok_cache", None)
+
+    assert IOSSimulatorManager(udid="A")._sudo_available() is True
+    now[0] += 30
+    assert IOSSimulatorManager(udid="B")._sudo_available() is True
+    assert len(probes) == 1
+
+    now[0] += 31
+    assert IOSSimulatorManager(udid="A")._sudo_available() is False
+    assert len(probes) == 2
+
+
+def test_emulator_manager_async_variants_run_concurrently() -> None:
+    """The *_async wrappers run blocking waits in threads, so several devices overlap."""
+    import asyncio
+    import threading
+
+    from mobiauto.device.base import EmulatorManager
+
+    barrier = threading.Barrier(2, timeout=2)
+    events: list[str] = []
+
+    class Fake(EmulatorManager):
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def start(self) -> None:
+            events.append(f"start {self.name}")
+
+        def stop(self) -> None:
+            events.append(f"stop {self.name}")
+
+        def wait_until_ready(self, timeout: int = 120) -> None:
+            barrier.wait()  # Deadlocks (BrokenBarrierError) unless both waits overlap
+            events.append(f"ready {self.name} {timeout}")
+
+    async def boot_all() -> None:
+        devices = [Fake("a"), Fake("b")]
+        await asyncio.gather(*(d.start_async() for d in devices))
+        await asyncio.gather(*(d.wait_until_ready_async(timeout=5) for d in devices))
+        await asyncio.gather(*(d.stop_async() for d in devices))
+
+    asyncio.run(boot_all())
+
+    assert sorted(events) == ["ready a 5", "ready b 5", "start a", "start b", "stop a", "stop b"]
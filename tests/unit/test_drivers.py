@@ -51,6 +51,28 @@ def test_dummyfactory_build_returns_driver_and_receives_caps() -> None:
     assert isinstance(f.received_caps, Mapping)
 
 
+def test_build_async_runs_build_in_worker_thread() -> None:
+    """build_async delegates to build (off the event loop thread) and returns its driver."""
+    import asyncio
+    import threading
+
+    threads: list[threading.Thread] = []
+
+    class ThreadRecordingFactory(DummyFactory):
+        def build(self, capabilities: Mapping[str, Any]) -> WebDriver:
+            threads.append(threading.current_thread())
+            return super().build(capabilities)
+
+    f = ThreadRecordingFactory()
+    caps: Mapping[str, Any] = {"platformName": "Android"}
+
+    drv = asyncio.run(f.build_async(caps))
+
+    assert hasattr(drv, "quit")
+    assert f.received_caps is caps
+    assert threads and threads[0] is not threading.main_thread()
+
+
 def test_android_driver_factory_build(monkeypatch: pytest.MonkeyPatch) -> None:
     """AndroidDriverFactory should configure options and call webdriver.Remote with proper URL/caps."""
     # Stub webdriver.Remote to avoid opening a real session
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import json
+import time
 from urllib import error, request
 
+import pytest
+
 from mobiauto.network.events import Event, EventData, EventStore
 
 
@@ -139,3 +142,123 @@ def test_wrong_path_returns_404_and_no_events(event_server: str, events: EventSt
     code, _ = _http_post_json(f"{event_server}/m/other", payload)
     assert code == 404
     assert events.get_events() == []
+
+
+def test_keep_alive_connection_serves_several_batches() -> None:
+    """Several POSTs over one HTTP/1.1 connection are all stored."""
+    from http.client import HTTPConnection
+
+    from mobiauto.network.event_server import BatchHttpServer
+
+    store = EventStore()
+    server = BatchHttpServer("127.0.0.1", 0, store)
+    server.start()
+    try:
+        conn = HTTPConnection(*server.address, timeout=5)
+        for i in range(3):
+            conn.request("POST", "/event", body=json.dumps({"i": i}))
+            resp = conn.getresponse()
+            assert (resp.status, resp.read()) == (200, b"OK")
+            assert not resp.will_close
+        conn.close()
+    finally:
+        server.stop()
+
+    assert [json.loads(e.data.body)["i"] for e in store.get_events() if e.data] == [0, 1, 2]
+
+
+def test_concurrent_posts_get_distinct_event_numbers() -> None:
+    """Parallel handlers number their events under the store lock: none is dropped."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from mobiauto.network.event_server import BatchHttpServer
+
+    store = EventStore()
+    server = BatchHttpServer("127.0.0.1", 0, store)
+    server.start()
+    try:
+        url = f"http://{server.address[0]}:{server.address[1]}/event"
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            codes = list(pool.map(lambda i: _http_post_json(url, {"i": i})[0], range(40)))
+    finally:
+        server.stop()
+
+    assert codes == [200] * 40
+    assert sorted(e.event_num for e in store.get_events()) == list(range(1, 41))
+
+
+def test_stop_closes_idle_keep_alive_connections() -> None:
+    """A connection left open after stop() cannot post into the stopped server's store."""
+    from http.client import HTTPConnection, HTTPException
+
+    from mobiauto.network.event_server import BatchHttpServer
+
+    store = EventStore()
+    server = BatchHttpServer("127.0.0.1", 0, store)
+    server.start()
+    conn = HTTPConnection(*server.address, timeout=5)
+    try:
+        conn.request("POST", "/event", body=json.dumps({"i": 0}))
+        assert conn.getresponse().read() == b"OK"
+        server.stop()
+
+        with pytest.raises((OSError, HTTPException)):
+            conn.request("POST", "/event", body=json.dumps({"i": 1}))
+            conn.getresponse().read()
+    finally:
+        conn.close()
+
+    assert [json.loads(e.data.body)["i"] for e in store.get_events() if e.data] == [0]
+
+
+def test_idle_keep_alive_connection_times_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The server drops a keep-alive connection that stays idle past the handler timeout."""
+    from http.client import HTTPConnection, HTTPException
+
+    from mobiauto.network.event_server import BatchHttpServer, _BatchHandler
+
+    monkeypatch.setattr(_BatchHandler, "timeout", 0.2)
+    server = BatchHttpServer("127.0.0.1", 0, EventStore())
+    server.start()
+    conn = HTTPConnection(*server.address, timeout=5)
+    try:
+        conn.request("GET", "/health")
+        assert conn.getresponse().read() == b"OK"
+        time.sleep(0.5)
+
+        with pytest.raises((OSError, HTTPException)):
+            conn.request("GET", "/health")
+            conn.getresponse().read()
+    finally:
+        conn.close()
+        server.stop()
+
+
+@pytest.mark.parametrize("length", ["-5", "abc"])
+def test_invalid_content_length_is_rejected_and_closes_connection(length: str) -> None:
+    """A negative or non-numeric Content-Length gets 400 and the connection is closed."""
+    import socket
+
+    from mobiauto.network.event_server import BatchHttpServer
+
+    store = EventStore()
+    server = BatchHttpServer("127.0.0.1", 0, store)
+    server.start()
+    try:
+        # Warm up the connection's body buffer first, as a keep-alive client would
+        with socket.create_connection(server.address, timeout=5) as sock:
+            sock.sendall(
+                b"POST /event HTTP/1.1\r\nHost: x\r\nContent-Length: 2\r\n\r\n{}"
+                b"POST /event HTTP/1.1\r\nHost: x\r\nContent-Length: "
+                + length.encode()
+                + b"\r\n\r\n{}"
+            )
+            with sock.makefile("rb") as resp:
+                received = resp.read()
+    finally:
+        server.stop()
+
+    assert received.startswith(b"HTTP/1.1 200 ")
+    assert b"HTTP/1.1 400 " in received
+    assert b"Connection: close" in received
+    assert len(store.get_events()) == 1
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import sys
+from enum import IntEnum, StrEnum
+from typing import Any
+
+import pytest
+
+from mobiauto.network.event_verifier import (
+    contains_json_data,
+    find_key_value_in_tree,
+    match_json_element,
+)
+
+
+def _event_json(body: Any) -> str:
+    """Serialized EventData-like object whose body is `body` as a JSON string."""
+    return json.dumps({"uri": "/event", "body": json.dumps(body)})
+
+
+class Color(StrEnum):
+    RED = "red"
+
+
+class Level(IntEnum):
+    HIGH = 3
+
+
+def test_match_json_element_accepts_scalar_subclasses() -> None:
+    """str/int subclasses (StrEnum, IntEnum) match like the plain values they wrap."""
+    assert match_json_element(Color.RED, "red")
+    assert match_json_element("red", Color.RED)
+    assert match_json_element(Color.RED, "~re")
+    assert match_json_element(Level.HIGH, 3)
+    assert match_json_element({"c": Color.RED, "l": Level.HIGH}, {"c": "red", "l": 3})
+    assert not match_json_element(Color.RED, "blue")
+
+
+@pytest.mark.parametrize(
+    ("actual", "expected", "matched"),
+    [
+        ("anything", "*", True),
+        (None, "*", True),
+        ({"a": 1}, "*", False),
+        ("", "", True),
+        ("x", "", False),
+        (0, "", False),
+        ("hello world", "~lo wo", True),
+        ("hello", "~bye", False),
+        (12, "~1", False),
+        ("abc", "abc", True),
+        (42, "42", True),
+        (True, "True", True),
+        (42, 42, True),
+        (42, 43, False),
+        (1.5, 1.5, True),
+        (None, None, True),
+        ("42", 42, False),
+    ],
+)
+def test_match_json_element_scalars(actual: Any, expected: Any, matched: bool) -> None:
+    assert match_json_element(actual, expected) is matched
+
+
+def test_match_json_element_nested_objects() -> None:
+    actual = {"meta": {"id": 7, "tags": {"env": "prod"}}, "extra": 1}
+    assert match_json_element(actual, {"meta": {"tags": {"env": "prod"}}})
+    assert match_json_element(actual, {"meta": {"id": "*"}, "extra": 1})
+    assert not match_json_element(actual, {"meta": {"tags": {"env": "dev"}}})
+    assert not match_json_element(actual, {"meta": {"missing": "*"}})
+    assert not match_json_element(actual, {"meta": [7]})
+
+
+def test_match_json_element_lists_match_any_item() -> None:
+    actual = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, 3]
+    assert match_json_element(actual, [{"name": "b"}])
+    assert match_json_element(actual, [3, {"id": 1}])
+    assert match_json_element(actual, [])
+    assert not match_json_element(actual, [{"name": "c"}])
+    assert not match_json_element(actual, [{"id": 1, "name": "b"}])
+
+
+def test_match_json_element_parses_json_inside_strings() -> None:
+    actual = {"payload": json.dumps({"user": {"id": 5, "roles": ["admin"]}})}
+    assert match_json_element(actual, {"payload": {"user": {"roles": ["admin"]}}})
+    assert not match_json_element(actual, {"payload": {"user": {"id": 6}}})
+    assert not match_json_element({"payload": "not json"}, {"payload": {"user": "*"}})
+
+
+def test_find_key_value_in_tree_searches_all_depths() -> None:
+    tree = {"a": [{"b": {"c": [{"target": "x"}]}}], "target": "y"}
+    assert find_key_value_in_tree(tree, "target", "x")
+    assert find_key_value_in_tree(tree, "target", "y")
+    assert find_key_value_in_tree(tree, "c", [{"target": "~x"}])
+    assert not find_key_value_in_tree(tree, "target", "z")
+    assert not find_key_value_in_tree(tree, "missing", "*")
+    assert not find_key_value_in_tree("scalar", "target", "*")
+
+
+def test_contains_json_data_matches_anywhere_in_body() -> None:
+    body = {"meta": {"app": "shop"}, "event": {"name": "click", "data": {"items": [{"sku": 1}]}}}
+    assert contains_json_data(_event_json(body), json.dumps({"app": "shop", "sku": 1}))
+    assert contains_json_data(_event_json(body), json.dumps({"items": [{"sku": 1}]}))
+    assert not contains_json_data(_event_json(body), json.dumps({"app": "shop", "sku": 2}))
+    assert not contains_json_data(_event_json(body), "not json")
+    assert not contains_json_data('{"body": "not json"}', json.dumps({"app": "shop"}))
+
+
+def test_matchers_handle_documents_deeper_than_the_recursion_limit() -> None:
+    depth = sys.getrecursionlimit() + 100
+    actual: Any = {"leaf": "found"}
+    expected: Any = {"leaf": "~fo"}
+    for _ in range(depth):
+        actual, expected = {"n": actual}, {"n": expected}
+    assert match_json_element(actual, expected)
+    assert find_key_value_in_tree(actual, "leaf", "found")
+
+
+def test_contains_json_data_rejects_missing_key_and_finds_deeply_nested_one() -> None:
+    body: Any = {"meta": {"app": "shop"}}
+    node = body
+    for i in range(50):
+        child = {"level": i}
+        node["child"] = child
+        node = child
+    node["deep"] = {"id": 99}
+    assert contains_json_data(_event_json(body), json.dumps({"deep": {"id": 99}, "app": "shop"}))
+    assert not contains_json_data(_event_json(body), json.dumps({"app": "shop", "absent": "*"}))
+    assert not contains_json_data(_event_json(body), json.dumps({"absent": "*", "deep": "*"}))
+
+
+@pytest.mark.parametrize(
+    "nest",
+    [lambda data: {"event": {"data": data}}, lambda data: {"data": data}],
+    ids=["event.data", "data"],
+)
+def test_contains_json_data_falls_back_from_data_node_without_rescanning_it(
+    monkeypatch: pytest.MonkeyPatch, nest: Any
+) -> None:
+    from mobiauto.network import event_verifier
+
+    calls: list[tuple[Any, Any]] = []
+
+    def counting_match(actual: Any, expected: Any) -> bool:
+        calls.append((actual, expected))
+        return match_json_element(actual, expected)
+
+    monkeypatch.setattr(event_verifier, "match_json_element", counting_match)
+    body = {**nest({"k": "inside", "items": [{"k": "item"}]}), "meta": {"only_out": "v"}}
+
+    # Only outside the data node: found by the body fallback
+    assert contains_json_data(_event_json(body), json.dumps({"only_out": "v"}))
+
+    # Only inside the data node: each candidate is compared once, not again by the fallback
+    calls.clear()
+    assert not contains_json_data(_event_json(body), json.dumps({"k": "missing"}))
+    assert sorted(actual for actual, _ in calls) == ["inside", "item"]
+
+    calls.clear()
+    assert contains_json_data(_event_json(body), json.dumps({"k": "item"}))
+    assert len(calls) <= 2
@@ -30,3 +30,22 @@ def test_attach_screenshot(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> N
     assert attached["name"] == "snap"
     assert isinstance(attached["data"], bytes)
     assert attached["data"].startswith(b"\x89PNG")
+
+
+def test_is_allure_collecting_tracks_step_listeners() -> None:
+    """Steps are considered collected only while a start_step listener is registered."""
+    import allure_commons
+
+    class Listener:
+        @allure_commons.hookimpl
+        def start_step(self, uuid: str, title: str, params: Any) -> None:
+            pass
+
+    listener = Listener()
+    before = ReportManager.is_allure_collecting()
+    allure_commons.plugin_manager.register(listener)
+    try:
+        assert ReportManager.is_allure_collecting() is True
+    finally:
+        allure_commons.plugin_manager.unregister(listener)
+    assert ReportManager.is_allure_collecting() is before
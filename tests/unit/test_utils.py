@@ -24,6 +24,13 @@ def test_run_cmd_success() -> None:
     assert "hello" in _stdout_to_str(out.stdout)
 
 
+def test_run_cmd_without_capture_discards_output() -> None:
+    """With capture_output=False only the exit code is kept; the output is discarded."""
+    out = run_cmd(["/bin/echo", "hello"], check=True, capture_output=False)
+    assert out.returncode == 0
+    assert out.stdout == "" and out.stderr == ""
+
+
 def test_run_cmd_error_check_true_raises() -> None:
     """When check=True and the command fails, run_cmd must raise CalledProcessError."""
     with pytest.raises(subprocess.CalledProcessError):
@@ -44,3 +51,4 @@ def test_run_cmd_spawn(monkeypatch: pytest.MonkeyPatch) -> None:
     p = run_cmd(["sleep", "1"], spawn=True)
     assert isinstance(p, DummyP)
     assert spawned["args"] == ["sleep", "1"]
+    assert spawned["kwargs"] == {"stdout": None, "stderr": None}
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import json
+import logging
 
 import pytest
 import structlog
 
-from mobiauto.utils.logging import setup_logging
+import mobiauto.utils.logging as logging_mod
+from mobiauto.utils.logging import is_enabled_for, setup_logging
 
 
 def test_setup_logging_produces_json(capsys: pytest.CaptureFixture[str]) -> None:
@@ -23,3 +25,13 @@ def test_setup_logging_produces_json(capsys: pytest.CaptureFixture[str]) -> None
     # TimeStamper adds a timestamp by default
     assert "timestamp" in data or "time" in data
     assert data["foo"] == 123
+
+
+def test_is_enabled_for_follows_configured_level() -> None:
+    """is_enabled_for compares against the level applied by setup_logging."""
+    setup_logging()
+    level = logging_mod._LEVEL
+    assert level is not None
+    assert is_enabled_for(level)
+    assert is_enabled_for(logging.CRITICAL)
+    assert not is_enabled_for(level - 1)